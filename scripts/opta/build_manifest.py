@@ -18,85 +18,166 @@ Manifest structure (parquet):
 - has_lineups: bool
 """
 
+import os
+from functools import reduce
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
 import argparse
 
 
-def build_manifest(opta_dir: str = "../../data/opta", output_path: str = None):
-    """Build manifest from existing parquet files."""
-    opta_path = Path(opta_dir)
+def _is_flag_column(name):
+    return name.startswith('has_') or name == 'event_unavailable'
 
-    if not opta_path.exists():
-        print(f"Opta directory not found: {opta_dir}")
-        return None
 
-    # We'll build the manifest from match_events (most complete table)
-    # and cross-reference with other tables
-    manifest_records = []
+def write_manifest(manifest_df, output_path):
+    """Write a manifest DataFrame with every has_*/event_unavailable flag as a
+    non-null Arrow bool_ column.
 
-    # Track which match_ids exist in each table type
-    table_match_ids = {
-        'player_stats': set(),
-        'shots': set(),
-        'match_events': set(),
-        'lineups': set(),
-    }
+    Arrow and parquet store bool_ as a 1-bit bitmap. A flag that arrives as
+    object (True/NaN after concatenating records that lack it, e.g.
+    has_stats_events) would otherwise be written as a nullable column or
+    fail to convert. Missing flags become False, matching the `== True`
+    checks readers already use.
+    """
+    table = pa.Table.from_pandas(manifest_df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if _is_flag_column(field.name):
+            column = table.column(i)
+            if not pa.types.is_boolean(column.type):
+                column = pc.equal(column.cast(pa.bool_()), True)
+            table = table.set_column(i, pa.field(field.name, pa.bool_(), nullable=False),
+                                     column.fill_null(False))
+    pq.write_table(table.replace_schema_metadata(None), output_path,
+                   compression='zstd', compression_level=3)
 
-    # Scan each table type
-    for table_type in table_match_ids.keys():
+
+def _scan_opta_tree(opta_path, table_types):
+    """Walk opta/{table_type}/{league}/*.parquet once with os.scandir.
+
+    Returns {table_type: [(league, season, path), ...]}. DirEntry carries
+    the file type from the directory read itself, so this avoids the
+    per-entry stat() calls of Path.iterdir() + is_dir() + glob().
+    """
+    tree = {table_type: [] for table_type in table_types}
+    for table_type in table_types:
         table_dir = opta_path / table_type
-        if not table_dir.exists():
+        try:
+            league_entries = list(os.scandir(table_dir))
+        except (FileNotFoundError, NotADirectoryError):
             continue
-
-        for league_dir in table_dir.iterdir():
-            if not league_dir.is_dir():
+        for league_entry in league_entries:
+            if not league_entry.is_dir():
                 continue
-            competition = league_dir.name
+            with os.scandir(league_entry.path) as files:
+                for entry in files:
+                    if entry.name.endswith('.parquet') and entry.is_file():
+                        tree[table_type].append(
+                            (league_entry.name, entry.name[:-len('.parquet')], Path(entry.path))
+                        )
+    return tree
 
-            for parquet_file in league_dir.glob("*.parquet"):
-                season = parquet_file.stem
-                try:
-                    df = pd.read_parquet(parquet_file, columns=['match_id'])
-                    match_ids = set(df['match_id'].unique())
 
-                    for mid in match_ids:
-                        table_match_ids[table_type].add((mid, competition, season))
+def _read_match_ids(parquet_file, batch_size=65_536):
+    """Return the distinct match_ids in a parquet file.
 
-                except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError) as e:
-                    print(f"  Warning: Error reading {parquet_file}: {e}")
+    Streams only the match_id column chunk batch by batch and keeps just the
+    per-batch uniques, so a large season file never materializes in full.
+    """
+    pf = pq.ParquetFile(parquet_file, memory_map=True)
+    uniques = [pc.unique(batch.column(0))
+               for batch in pf.iter_batches(batch_size=batch_size, columns=['match_id'])]
+    if not uniques:
+        return set()
+    return set(pc.unique(pa.concat_arrays(uniques)).to_pylist())
 
-    print(f"Found matches by table type:")
-    for table_type, matches in table_match_ids.items():
-        print(f"  {table_type}: {len(matches)} match-league-season combinations")
 
-    # Build manifest from match_events (primary source) with metadata
-    # For match metadata, we need to read from a table that has team info
-    # Let's check lineups or player_stats for team names
+def _read_file_keys(files):
+    """Read match_ids file by file; returns one key frame per readable file."""
+    frames = []
+    for competition, season, parquet_file in files:
+        try:
+            match_ids = _read_match_ids(parquet_file)
+        except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError) as e:
+            print(f"  Warning: Error reading {parquet_file}: {e}")
+            continue
+        frames.append(pd.DataFrame({
+            'match_id': list(match_ids),
+            'competition': competition,
+            'season': season,
+        }))
+    return frames
 
-    # First pass: collect all unique (match_id, competition, season) tuples
-    all_matches = set()
-    for matches in table_match_ids.values():
-        all_matches.update(matches)
 
-    print(f"\nTotal unique match-league-season combinations: {len(all_matches)}")
+def _scan_keys(files):
+    """Return (match_id, competition, season) key frames for the given
+    (competition, season, path) entries.
 
-    # Build manifest records
-    for match_id, competition, season in sorted(all_matches):
-        has_events = (match_id, competition, season) in table_match_ids['match_events']
-        record = {
-            'match_id': match_id,
-            'competition': competition,
-            'season': season,
-            'has_player_stats': (match_id, competition, season) in table_match_ids['player_stats'],
-            'has_shots': (match_id, competition, season) in table_match_ids['shots'],
-            'has_match_events': has_events,
-            'has_lineups': (match_id, competition, season) in table_match_ids['lineups'],
-            'event_unavailable': not has_events,  # Mark as unavailable if no events
-        }
-        manifest_records.append(record)
+    Reads every file's match_id column in one multithreaded dataset scan and
+    dedups (file, match_id) pairs with an Arrow group_by. If the scan fails
+    (an unreadable or schema-incompatible file), falls back to reading file
+    by file so the bad file is reported and skipped on its own.
+    """
+    if not files:
+        return []
+    try:
+        dataset = ds.dataset([str(path) for _, _, path in files], format='parquet')
+        table = dataset.to_table(columns=['match_id', '__filename'])
+    except (OSError, ValueError, TypeError, NotImplementedError) as e:
+        print(f"  Dataset scan failed ({e}); reading files individually")
+        return _read_file_keys(files)
+
+    pairs = table.group_by(['__filename', 'match_id']).aggregate([])
+    # dataset.files preserves input order, in Arrow's normalized path form
+    labels = pa.table({
+        '__filename': dataset.files,
+        'competition': [competition for competition, _, _ in files],
+        'season': [season for _, season, _ in files],
+    })
+    keyed = pairs.join(labels, '__filename').select(['match_id', 'competition', 'season'])
+    return [keyed.to_pandas()]
+
+
+def _load_previous_keys(output_path):
+    """Load the manifest at output_path for incremental reuse.
 
-    manifest_df = pd.DataFrame(manifest_records)
+    Returns (mtime, {(competition, season): DataFrame}) or (None, {}) when
+    there is no readable previous manifest.
+    """
+    if not output_path.exists():
+        return None, {}
+    try:
+        mtime = output_path.stat().st_mtime
+        previous = pd.read_parquet(output_path)
+        groups = {cs: group for cs, group in previous.groupby(['competition', 'season'])}
+    except (pd.errors.ParserError, OSError, ValueError, KeyError) as e:
+        print(f"  Warning: Could not reuse previous manifest {output_path}: {e}")
+        return None, {}
+    print(f"Incremental: reusing {len(previous):,} rows from {output_path} "
+          f"for unchanged files")
+    return mtime, groups
+
+
+def build_manifest(opta_dir: str = "../../data/opta", output_path: str = None,
+                   incremental: bool = False):
+    """Build manifest from existing parquet files.
+
+    With incremental=True, files not modified since the previous manifest at
+    output_path was written are not re-read; their (competition, season)
+    rows are carried over from that manifest. Only use this when the
+    previous manifest was itself produced by build_manifest — rows written
+    by the scraper's update_manifest record what was fetched, not what is
+    on disk.
+    """
+    opta_path = Path(opta_dir)
+
+    if not opta_path.exists():
+        print(f"Opta directory not found: {opta_dir}")
+        return None
 
     # Output path
     if output_path is None:
@@ -104,7 +185,60 @@ def build_manifest(opta_dir: str = "../../data/opta", output_path: str = None):
     else:
         output_path = Path(output_path)
 
-    manifest_df.to_parquet(output_path, index=False, compression='gzip')
+    key_cols = ['match_id', 'competition', 'season']
+    table_types = ['player_stats', 'shots', 'match_events', 'lineups']
+
+    manifest_mtime, previous_keys = (
+        _load_previous_keys(output_path) if incremental else (None, {})
+    )
+    n_reused = 0
+
+    # Scan each table type into a frame of (match_id, competition, season) keys
+    tree = _scan_opta_tree(opta_path, table_types)
+    table_keys = {}
+    for table_type in table_types:
+        frames = []
+        to_read = []
+        for competition, season, parquet_file in tree[table_type]:
+            previous = previous_keys.get((competition, season))
+            try:
+                if previous is not None and parquet_file.stat().st_mtime <= manifest_mtime:
+                    has_col = f'has_{table_type}'
+                    if has_col in previous.columns:
+                        frames.append(previous.loc[previous[has_col] == True, key_cols])
+                        n_reused += 1
+                        continue
+            except OSError as e:
+                print(f"  Warning: Error reading {parquet_file}: {e}")
+                continue
+            to_read.append((competition, season, parquet_file))
+        frames.extend(_scan_keys(to_read))
+
+        keys = (pd.concat(frames, ignore_index=True).drop_duplicates()
+                if frames else pd.DataFrame(columns=key_cols))
+        keys[f'has_{table_type}'] = True
+        table_keys[table_type] = keys
+
+    if incremental:
+        print(f"Incremental: {n_reused} unchanged files reused from previous manifest")
+    print(f"Found matches by table type:")
+    for table_type, keys in table_keys.items():
+        print(f"  {table_type}: {len(keys)} match-league-season combinations")
+
+    # Outer-join the per-table key frames: a match present in any table gets
+    # one manifest row, with has_* False for the tables it is missing from
+    manifest_df = reduce(
+        lambda left, right: left.merge(right, on=key_cols, how='outer'),
+        table_keys.values(),
+    )
+    has_cols = [f'has_{t}' for t in table_types]
+    manifest_df[has_cols] = manifest_df[has_cols].notna()
+    manifest_df = manifest_df.sort_values(key_cols, ignore_index=True)
+    manifest_df['event_unavailable'] = ~manifest_df['has_match_events']  # Mark as unavailable if no events
+
+    print(f"\nTotal unique match-league-season combinations: {len(manifest_df)}")
+
+    write_manifest(manifest_df, output_path)
 
     size_kb = output_path.stat().st_size / 1024
     print(f"\nManifest saved to: {output_path}")
@@ -128,9 +262,12 @@ def main():
                        help="Path to opta data directory")
     parser.add_argument("--output", "-o",
                        help="Output path for manifest (default: data/opta-manifest.parquet)")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Only re-read parquet files modified since the existing manifest "
+                            "at --output was built; reuse its rows for the rest")
     args = parser.parse_args()
 
-    build_manifest(args.opta_dir, args.output)
+    build_manifest(args.opta_dir, args.output, incremental=args.incremental)
 
 
 if __name__ == "__main__":
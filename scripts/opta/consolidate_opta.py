@@ -6,10 +6,11 @@ Reads from: opta/{table_type}/{league}/{season}.parquet
 Writes to:  opta/opta_{table_type}.parquet
            opta/events_consolidated/events_{league}.parquet (per-league events)
 
-Uses a league-by-league approach to minimize memory usage: splits existing
-consolidated files into per-league temp files, processes one league at a
-time, and writes output via PyArrow ParquetWriter. This keeps peak memory
-at ~1 league's worth of data instead of the entire dataset.
+Uses a league-by-league approach to minimize memory usage: locates each
+league's rows in the existing consolidated file (by row group, or via
+per-league temp files), processes one league at a time, and writes output
+via PyArrow ParquetWriter. This keeps peak memory at ~1 league's worth of
+new data instead of the entire dataset.
 """
 
 import gc
@@ -19,12 +20,15 @@ import os
 import shutil
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
 import pyarrow as pa
 import pyarrow.compute as pc
+import pyarrow.fs as pafs
 import pyarrow.lib
 import pyarrow.parquet as pq
 
@@ -32,18 +36,47 @@ from competition_metadata import get_competition_metadata, PANNA_ALIASES
 
 logger = logging.getLogger(__name__)
 
+# Parquet decode releases the GIL, so per-league season files are read on a
+# thread pool. Capped so a league with many seasons doesn't spawn one thread
+# per file on large runners.
+MAX_READ_WORKERS = min(32, os.cpu_count() or 1)
+
+_READ_ERRORS = (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
+                pyarrow.lib.ArrowInvalid)
+
+
+# Deduplication keys per table type. Keys absent from a table's schema are
+# dropped at dedup time, so 'second' only applies to events files that have it.
+DEDUP_KEYS = {
+    'shot_events': ['match_id', 'event_id'],
+    'match_events': ['match_id', 'event_id'],
+    'events': ['match_id', 'event_type', 'minute', 'player_id', 'second'],
+    'fixtures': ['match_id'],
+}
+# player_stats, lineups, shots (all other table types)
+DEFAULT_DEDUP_KEYS = ['match_id', 'player_id']
+
 
 def _get_dedup_cols(table_type):
     """Return deduplication columns for a given table type."""
-    if table_type in ('shot_events', 'match_events'):
-        return ['match_id', 'event_id']
-    elif table_type == 'events':
-        return ['match_id', 'event_type', 'minute', 'player_id']
-    elif table_type == 'fixtures':
-        return ['match_id']
-    else:
-        # player_stats, lineups, shots, fixtures (all other table types)
-        return ['match_id', 'player_id']
+    return list(DEDUP_KEYS.get(table_type, DEFAULT_DEDUP_KEYS))
+
+
+# New rows are written sorted by (season, match_id) in row groups of this
+# size, so the min/max statistics on match_id stay tight enough for readers
+# to skip row groups with a match_id predicate.
+ROW_GROUP_SIZE = 64_000
+SORT_KEYS = ('season', 'match_id')
+
+
+def _sort_for_pushdown(table):
+    """Sort a league's new rows by season then match_id.
+
+    Arrow's sort is stable, so rows of the same match (e.g. events) keep
+    their scraped order.
+    """
+    keys = [(k, 'ascending') for k in SORT_KEYS if k in table.schema.names]
+    return table.sort_by(keys) if keys else table
 
 
 def _parse_force_full_env():
@@ -60,6 +93,19 @@ def _parse_force_full_env():
     )
 
 
+def _find_parquet_files(root, recursive=True):
+    """List *.parquet files under root with a single pyarrow filesystem call.
+
+    LocalFileSystem.get_file_info walks the tree in C++ (readdir with the
+    entry types it returns) instead of pathlib's per-entry Python stat
+    loop. Returns sorted Paths; an empty list if root doesn't exist.
+    """
+    selector = pafs.FileSelector(str(root), recursive=recursive, allow_not_found=True)
+    infos = pafs.LocalFileSystem().get_file_info(selector)
+    return sorted(Path(info.path) for info in infos
+                  if info.type == pafs.FileType.File and info.path.endswith('.parquet'))
+
+
 def _consolidated_is_fresh(existing_path, source_files):
     """Return True if the consolidated parquet at existing_path is usable
     AND newer than every file in source_files AND contains every per-league
@@ -111,9 +157,11 @@ def _consolidated_is_fresh(existing_path, source_files):
     # set against the `competition` column of the consolidated parquet.
     source_comps = {Path(f).parent.name for f in source_files}
     try:
+        # read_dictionary keeps the column as parquet's dictionary pages, so
+        # unique() hashes int32 codes instead of one string per row
         cons_comps = set(pq.read_table(
-            existing_path, columns=["competition"]
-        ).column("competition").to_pylist())
+            existing_path, columns=["competition"], read_dictionary=["competition"]
+        ).column("competition").unique().to_pylist())
         cons_comps.discard(None)
     except (OSError, pa.ArrowInvalid, pyarrow.lib.ArrowInvalid, KeyError) as e:
         print(f"  WARNING: could not read competition column from "
@@ -137,7 +185,7 @@ def _split_existing_by_league(parquet_file, temp_dir, batch_size=50_000):
     when columns only appear in certain row ranges.
     Returns total row count of the existing file.
     """
-    pf = pq.ParquetFile(parquet_file)
+    pf = pq.ParquetFile(parquet_file, memory_map=True)
     file_schema = pf.schema_arrow
     writers = {}
     total = 0
@@ -177,6 +225,35 @@ def _split_existing_by_league(parquet_file, temp_dir, batch_size=50_000):
     return total
 
 
+def _league_row_groups(parquet_file):
+    """Map each competition to the row groups that hold it.
+
+    Uses only footer statistics. Returns None unless every non-empty row
+    group holds exactly one non-null competition (min == max); callers
+    then fall back to _split_existing_by_league.
+    """
+    metadata = pq.read_metadata(parquet_file)
+    col_idx = None
+    for i in range(metadata.num_columns):
+        if metadata.schema.column(i).path == 'competition':
+            col_idx = i
+            break
+    if col_idx is None:
+        return None
+
+    groups = {}
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        if row_group.num_rows == 0:
+            continue
+        stats = row_group.column(col_idx).statistics
+        if (stats is None or not stats.has_min_max or not stats.has_null_count
+                or stats.null_count or stats.min != stats.max):
+            return None
+        groups.setdefault(stats.min, []).append(i)
+    return groups
+
+
 def _align_table(table, target_schema):
     """Align a PyArrow table to match the target schema.
 
@@ -259,37 +336,90 @@ def _cleanup_temp_dir(temp_dir):
         print(f"  WARNING: Could not clean up temp dir {temp_dir}: {e}")
 
 
-def _cast_mixed_to_string(col):
-    """Cast object-dtype column to string, preserving nulls.
+def _read_source_table(path, league, target_schema):
+    """Read one per-league season file as an Arrow table.
+
+    Stamps the constant competition/season columns (league dir name and
+    file stem) and aligns to target_schema so tables from different seasons
+    can be passed straight to pa.concat_tables without a pandas round trip.
+    """
+    table = pq.read_table(path, memory_map=True)
+    for col_name, value in (('competition', league), ('season', path.stem)):
+        col = pa.repeat(pa.scalar(value, type=pa.string()), len(table))
+        if col_name in table.column_names:
+            table = table.set_column(table.column_names.index(col_name), col_name, col)
+        else:
+            table = table.append_column(col_name, col)
+    return _align_table(table, target_schema)
+
+
+def _read_concurrently(tasks):
+    """Run (path, read_fn) tasks on a thread pool.
 
-    Whole floats become '2' not '2.0' — important for columns like score
-    that may contain a mix of int, float, and string values across seasons.
+    Returns a list of (path, result) in input order, where result is the
+    table read_fn returned or the read error it raised — callers report
+    failures per file exactly as the serial loop did.
     """
-    import math
+    if not tasks:
+        return []
 
-    def _to_str(v):
-        if v is None or (isinstance(v, float) and math.isnan(v)):
-            return v
-        if isinstance(v, float):
-            if math.isinf(v) or abs(v) > 1e15:
-                return str(v)
-            if v == int(v):
-                return str(int(v))
-        return str(v)
+    def _run(read_fn):
+        try:
+            return read_fn()
+        except _READ_ERRORS as e:
+            return e
 
-    return col.apply(_to_str)
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(tasks))) as ex:
+        results = list(ex.map(_run, [read_fn for _, read_fn in tasks]))
+    return [(path, result) for (path, _), result in zip(tasks, results)]
 
 
-def _cast_mixed_columns(df, schema):
-    """Cast object-dtype columns to string where schema expects string."""
-    if schema is None:
-        return df
-    for field in schema:
-        if field.type == pa.string() and field.name in df.columns:
-            col = df[field.name]
-            if col.dtype == object:
-                df[field.name] = _cast_mixed_to_string(col)
-    return df
+def _key_column(table, keys):
+    """Collapse the key columns of a table into one string column.
+
+    Lets multi-column keys go through pc.is_in. Nulls get a sentinel so
+    they match each other (as in dedup_keep_last) but never an empty string.
+    """
+    parts = [pc.cast(table.column(k), pa.string()) for k in keys]
+    if len(parts) == 1:
+        return pc.fill_null(parts[0], '\x00')
+    return pc.binary_join_element_wise(
+        *parts, '\x1f', null_handling='replace', null_replacement='\x00'
+    )
+
+
+def dedup_keep_last(table, keys):
+    """Drop duplicate key combinations, keeping the last occurrence.
+
+    Arrow equivalent of DataFrame.drop_duplicates(subset=keys, keep='last'):
+    tags each row with its position, takes the max position per key group
+    via the C++ hash aggregator, then gathers those rows back in their
+    original order. Nulls group together, matching pandas semantics.
+    """
+    row_ids = pa.array(range(len(table)), type=pa.int64())
+    grouped = table.select(keys).append_column('_row', row_ids) \
+        .group_by(keys).aggregate([('_row', 'max')])
+    last_rows = grouped.column('_row_max')
+    return table.take(pc.take(last_rows, pc.array_sort_indices(last_rows)))
+
+
+def _dedup_keyed_events(table, keys):
+    """dedup_keep_last over the rows that have an event_id, in original order.
+
+    event_id is in the unified schema whenever any file (including the
+    existing consolidated one) has it, so new files scraped without it
+    arrive with an all-null column. Those rows have no event key and are
+    kept as-is rather than collapsed to one row per match.
+    """
+    keyed = pc.is_valid(table.column('event_id')).combine_chunks()
+    row_ids = pa.array(range(len(table)), type=pa.int64())
+    keyed_rows = dedup_keep_last(
+        table.filter(keyed).select(keys).append_column('_row', pc.filter(row_ids, keyed)),
+        keys,
+    ).column('_row')
+    rows = pa.concat_arrays([keyed_rows.combine_chunks(),
+                             pc.filter(row_ids, pc.invert(keyed))])
+    return table.take(pc.take(rows, pc.array_sort_indices(rows)))
 
 
 def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
@@ -299,7 +429,7 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
     hierarchical files. Uses PyArrow streaming to avoid loading entire
     league histories into memory.
 
-    Approach: read new season files into pandas (small), collect their
+    Approach: read new season files as Arrow tables (small), collect their
     match_ids, then stream-read the existing consolidated file in batches,
     filtering OUT rows whose match_id is in the new set (whole-match
     replacement ensures re-scraped matches fully supersede old data).
@@ -325,7 +455,7 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
 
     for league in leagues:
         league_dir = events_dir / league
-        parquet_files = list(league_dir.glob("*.parquet")) if league_dir.exists() else []
+        parquet_files = _find_parquet_files(league_dir, recursive=False)
         existing_file = output_path / f"events_{league}.parquet"
 
         if not parquet_files and not existing_file.exists():
@@ -347,49 +477,13 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
                   f"(set OPTA_CONSOLIDATE_FORCE=1 to override)")
             continue
 
-        # Phase 1: Read new season files into pandas (small — just recent data)
-        new_dfs = []
-        for f in parquet_files:
-            try:
-                df = pd.read_parquet(f)
-                df['competition'] = league
-                df['season'] = f.stem
-                new_dfs.append(df)
-            except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
-                    pyarrow.lib.ArrowInvalid) as e:
-                print(f"  ERROR: Failed to read {f}: {e}")
-                errors += 1
-
-        new_dfs = [df for df in new_dfs if not df.empty]
-        if not new_dfs and not existing_file.exists():
-            continue
-
-        # Concat and deduplicate new data by match_id + event_id
-        if new_dfs:
-            new_df = pd.concat(new_dfs, ignore_index=True)
-            del new_dfs
-            if 'match_id' not in new_df.columns:
-                print(f"  ERROR: {league} new data missing 'match_id' column. "
-                      f"Columns: {list(new_df.columns)}. Skipping league.")
-                del new_df
-                errors += 1
-                continue
-            if 'event_id' in new_df.columns:
-                new_df = new_df.drop_duplicates(subset=['match_id', 'event_id'], keep='last')
-            new_match_ids = set(new_df['match_id'].unique())
-        else:
-            new_df = None
-            new_match_ids = set()
-
-        # Phase 2: Build unified schema from existing + new files
+        # Phase 1: Build unified schema from existing + new files
         unified_schema = _build_unified_schema(
             existing_file if existing_file.exists() else None,
             parquet_files
         )
         if unified_schema is None:
             print(f"  ERROR: Could not determine schema for {league}")
-            if new_df is not None:
-                del new_df
             errors += 1
             continue
 
@@ -398,6 +492,38 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
             if col_name not in unified_schema.names:
                 unified_schema = unified_schema.append(pa.field(col_name, pa.string()))
 
+        if 'match_id' not in unified_schema.names:
+            print(f"  ERROR: {league} data missing 'match_id' column. "
+                  f"Columns: {unified_schema.names}. Skipping league.")
+            errors += 1
+            continue
+
+        # Phase 2: Read new season files as Arrow tables (small — just recent data)
+        new_tables = []
+        for f, result in _read_concurrently(
+                [(f, partial(_read_source_table, f, league, unified_schema))
+                 for f in parquet_files]):
+            if isinstance(result, Exception):
+                print(f"  ERROR: Failed to read {f}: {result}")
+                errors += 1
+            else:
+                new_tables.append(result)
+
+        new_tables = [t for t in new_tables if len(t) > 0]
+        if not new_tables and not existing_file.exists():
+            continue
+
+        # Concat and deduplicate new data by match_id + event_id
+        if new_tables:
+            new_table = pa.concat_tables(new_tables)
+            del new_tables
+            if 'event_id' in unified_schema.names:
+                new_table = _dedup_keyed_events(new_table, _get_dedup_cols('match_events'))
+            new_match_ids = pc.unique(new_table.column('match_id'))
+        else:
+            new_table = None
+            new_match_ids = pa.array([], type=pa.string())
+
         # Phase 3: Stream-write output — filtered existing batches, then new data
         output_file = output_path / f"events_{league}.parquet"
         temp_output = output_file.with_suffix('.parquet.new')
@@ -410,7 +536,7 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
             # Stream existing file, filtering out match_ids that will be replaced
             if existing_file.exists():
                 try:
-                    pf = pq.ParquetFile(existing_file)
+                    pf = pq.ParquetFile(existing_file, memory_map=True)
                     existing_count = pf.metadata.num_rows
                     print(f"  {league}: Streaming {existing_count:,} existing rows")
 
@@ -418,10 +544,10 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
                         table = pa.Table.from_batches([batch])
 
                         # Filter out rows whose match_id is in the new data
-                        if new_match_ids and 'match_id' in table.column_names:
+                        if len(new_match_ids) and 'match_id' in table.column_names:
                             match_ids = table.column('match_id')
                             # Build mask: keep rows NOT in new_match_ids
-                            mask = pc.invert(pc.is_in(match_ids, pa.array(list(new_match_ids))))
+                            mask = pc.invert(pc.is_in(match_ids, value_set=new_match_ids))
                             table = table.filter(mask)
 
                         if len(table) == 0:
@@ -431,12 +557,14 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
                         table = _align_table(table, unified_schema)
                         if writer is None:
                             writer = pq.ParquetWriter(
-                                str(temp_output), unified_schema, compression='zstd'
+                                str(temp_output), unified_schema,
+                                compression='zstd', compression_level=3
                             )
                         writer.write_table(table)
                         total_rows += len(table)
                         del table
 
+                    pf.close()
                     del pf
                     gc.collect()
                 except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
@@ -444,8 +572,8 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
                     print(f"  ERROR: Failed to stream existing {existing_file}: {e}")
                     print(f"  Skipping {league} to prevent data loss")
                     errors += 1
-                    if new_df is not None:
-                        del new_df
+                    if new_table is not None:
+                        del new_table
                     # Close writer and clean up partial temp file
                     if writer:
                         try:
@@ -461,21 +589,19 @@ def consolidate_events_by_league(opta_dir="opta", output_dir="opta"):
                     continue
 
             # Append new data
-            if new_df is not None and not new_df.empty:
-                _cast_mixed_columns(new_df, unified_schema)
-                new_table = pa.Table.from_pandas(new_df, preserve_index=False)
-                del new_df
-                new_table = _align_table(new_table, unified_schema)
+            if new_table is not None and len(new_table) > 0:
                 if writer is None:
                     writer = pq.ParquetWriter(
-                        str(temp_output), unified_schema, compression='zstd'
+                        str(temp_output), unified_schema,
+                        compression='zstd', compression_level=3
                     )
-                writer.write_table(new_table)
+                writer.write_table(_sort_for_pushdown(new_table),
+                                   row_group_size=ROW_GROUP_SIZE)
                 total_rows += len(new_table)
                 del new_table
                 gc.collect()
-            elif new_df is not None:
-                del new_df
+            elif new_table is not None:
+                del new_table
         except Exception as e:
             print(f"  ERROR: Unexpected error processing {league}: {e}")
             errors += 1
@@ -557,11 +683,14 @@ def consolidate_opta(opta_dir="opta", output_dir="opta"):
     """Consolidate all Opta parquet files by table type.
 
     Uses a league-by-league approach to minimize memory:
-    1. Split existing consolidated file into per-league temp files (batch read)
-    2. For each league: merge existing + new per-league files, dedupe
-    3. Write output via ParquetWriter (one league at a time in memory)
-
-    Peak memory: ~1 league's data instead of the entire dataset.
+    1. Index existing consolidated file by league via row-group statistics
+       (or split it into per-league temp files when rows aren't partitioned)
+    2. For each league: dedupe the new per-league files, then stream the
+       existing temp file in batches, dropping rows the new data supersedes
+    3. Write both via ParquetWriter (only new data is held in memory), new
+       rows sorted by season/match_id for row-group pruning
+
+    Peak memory: ~1 league's new data plus one batch of existing rows.
     """
     opta_path = Path(opta_dir)
     output_path = Path(output_dir)
@@ -583,7 +712,7 @@ def consolidate_opta(opta_dir="opta", output_dir="opta"):
 
     for table_type in table_types:
         tt_dir = opta_path / table_type
-        new_files = list(tt_dir.glob("**/*.parquet"))
+        new_files = _find_parquet_files(tt_dir)
 
         if not new_files:
             print(f"  Skipping {table_type} - no parquet files")
@@ -616,22 +745,35 @@ def consolidate_opta(opta_dir="opta", output_dir="opta"):
             league = f.parent.name
             new_by_league.setdefault(league, []).append(f)
 
-        # Phase 1: Split existing consolidated into per-league temp files
+        # Phase 1: Index existing consolidated file by league. Each league is
+        # written in its own write_table calls, so its rows normally sit in
+        # dedicated row groups and can be streamed in place. Older or
+        # externally-written files fall back to a per-league temp split.
         temp_dir = Path(tempfile.mkdtemp(prefix=f"opta_{table_type}_"))
         existing_total = 0
         existing_leagues = set()
+        existing_pf = None
+        existing_groups = None
 
         if existing_path.exists():
             try:
-                print(f"  Splitting existing {existing_path.name} by league...")
-                existing_total = _split_existing_by_league(existing_path, temp_dir)
-                existing_leagues = {f.stem for f in temp_dir.glob("*.parquet")}
-                print(f"  Split {existing_total:,} existing rows into {len(existing_leagues)} leagues")
-                # Validate split didn't lose rows
-                expected_total = pq.read_metadata(existing_path).num_rows
-                if existing_total != expected_total:
-                    print(f"  WARNING: Split produced {existing_total:,} rows but file has "
-                          f"{expected_total:,}. Some rows may have been lost during split.")
+                existing_groups = _league_row_groups(existing_path)
+                if existing_groups is not None:
+                    existing_pf = pq.ParquetFile(existing_path, memory_map=True)
+                    existing_total = existing_pf.metadata.num_rows
+                    existing_leagues = set(existing_groups)
+                    print(f"  Indexed {existing_total:,} existing rows into "
+                          f"{len(existing_leagues)} leagues by row group")
+                else:
+                    print(f"  Splitting existing {existing_path.name} by league...")
+                    existing_total = _split_existing_by_league(existing_path, temp_dir)
+                    existing_leagues = {f.stem for f in temp_dir.glob("*.parquet")}
+                    print(f"  Split {existing_total:,} existing rows into {len(existing_leagues)} leagues")
+                    # Validate split didn't lose rows
+                    expected_total = pq.read_metadata(existing_path).num_rows
+                    if existing_total != expected_total:
+                        print(f"  WARNING: Split produced {existing_total:,} rows but file has "
+                              f"{expected_total:,}. Some rows may have been lost during split.")
             except (OSError, pa.ArrowInvalid, pa.ArrowNotImplementedError,
                     pd.errors.ParserError, ValueError, KeyError) as e:
                 print(f"  ERROR: Failed to split existing {existing_path}: {e}")
@@ -644,6 +786,8 @@ def consolidate_opta(opta_dir="opta", output_dir="opta"):
         unified_schema = _build_unified_schema(existing_path, new_files)
         if unified_schema is None:
             print(f"  ERROR: Could not determine schema for {table_type}")
+            if existing_pf is not None:
+                existing_pf.close()
             _cleanup_temp_dir(temp_dir)
             errors += 1
             continue
@@ -662,72 +806,85 @@ def consolidate_opta(opta_dir="opta", output_dir="opta"):
         writer = None
         total_rows = 0
 
+        # Dedup keys are a property of the schema, not the league
+        valid_dedup = ([c for c in dedup_cols if c in unified_schema.names]
+                       if 'match_id' in unified_schema.names else [])
+
         try:
+            writer = pq.ParquetWriter(
+                str(temp_output), unified_schema,
+                compression='zstd', compression_level=3
+            )
             for league in all_leagues:
-                dfs = []
-
-                # Load existing data for this league from temp file
-                league_temp = temp_dir / f"{league}.parquet"
-                if league_temp.exists():
-                    try:
-                        dfs.append(pd.read_parquet(league_temp))
-                    except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
-                            pyarrow.lib.ArrowInvalid) as e:
-                        print(f"  ERROR: Failed to read existing data for {league} from temp: {e}")
-                        print(f"  Existing {league} data will be LOST in output.")
-                        errors += 1
-
-                # Load new per-league files
-                for f in new_by_league.get(league, []):
-                    try:
-                        df = pd.read_parquet(f)
-                        df['competition'] = league
-                        df['season'] = f.stem
-                        dfs.append(df)
-                    except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
-                            pyarrow.lib.ArrowInvalid) as e:
-                        print(f"  ERROR: Failed to read {f}: {e}")
+                # Load new per-league files (small — just the re-scraped seasons)
+                new_tables = []
+                for f, result in _read_concurrently(
+                        [(f, partial(_read_source_table, f, league, unified_schema))
+                         for f in new_by_league.get(league, [])]):
+                    if isinstance(result, Exception):
+                        print(f"  ERROR: Failed to read {f}: {result}")
                         errors += 1
+                    else:
+                        new_tables.append(result)
+                new_tables = [t for t in new_tables if len(t) > 0]
+
+                new_table = pa.concat_tables(new_tables) if new_tables else None
+                del new_tables
+                dupes = 0
+                new_keys = None
+                if new_table is not None and valid_dedup:
+                    before = len(new_table)
+                    new_table = dedup_keep_last(new_table, valid_dedup)
+                    dupes += before - len(new_table)
+                    new_keys = pc.unique(_key_column(new_table, valid_dedup))
+
+                # Stream existing rows for this league, dropping any row a
+                # new row supersedes. New rows are written after the
+                # survivors, so this is keep='last' over existing + new
+                # without holding the league's history in memory.
+                league_temp = temp_dir / f"{league}.parquet"
+                try:
+                    if existing_groups is not None:
+                        # iter_batches(row_groups=[]) raises rather than
+                        # yielding nothing, so a league new to the file
+                        # has no existing rows to stream
+                        existing_batches = (
+                            existing_pf.iter_batches(row_groups=existing_groups[league])
+                            if league in existing_groups else [])
+                    elif league_temp.exists():
+                        existing_batches = pq.ParquetFile(league_temp, memory_map=True).iter_batches()
+                    else:
+                        existing_batches = []
+                    for batch in existing_batches:
+                        table = _align_table(pa.Table.from_batches([batch]), unified_schema)
+                        if new_keys is not None:
+                            before = len(table)
+                            table = table.filter(pc.invert(pc.is_in(
+                                _key_column(table, valid_dedup), value_set=new_keys)))
+                            dupes += before - len(table)
+                        if len(table) > 0:
+                            writer.write_table(table)
+                            total_rows += len(table)
+                        del table
+                except _READ_ERRORS as e:
+                    print(f"  ERROR: Failed to read existing data for {league}: {e}")
+                    print(f"  Existing {league} data will be LOST in output.")
+                    errors += 1
 
-                non_empty = [df for df in dfs if not df.empty]
-                if not non_empty:
-                    del dfs
-                    continue
-                dfs = non_empty
-
-                # Concat within this league
-                league_df = pd.concat(dfs, ignore_index=True)
-                del dfs
-
-                # Dedupe within this league
-                valid_dedup = [c for c in dedup_cols if c in league_df.columns]
-                if valid_dedup and 'match_id' in league_df.columns:
-                    before = len(league_df)
-                    # For events table, also use 'second' if available
-                    if table_type == 'events' and 'second' in league_df.columns:
-                        if 'second' not in valid_dedup:
-                            valid_dedup.append('second')
-                    league_df = league_df.drop_duplicates(subset=valid_dedup, keep='last')
-                    dupes = before - len(league_df)
-                    if dupes > 0:
-                        print(f"    {league}: removed {dupes:,} duplicates")
-
-                _cast_mixed_columns(league_df, unified_schema)
-
-                # Convert to PyArrow and align schema
-                table = pa.Table.from_pandas(league_df, preserve_index=False)
-                del league_df
-                table = _align_table(table, unified_schema)
+                if dupes > 0:
+                    print(f"    {league}: removed {dupes:,} duplicates")
 
-                if writer is None:
-                    writer = pq.ParquetWriter(str(temp_output), unified_schema)
-                writer.write_table(table)
-                total_rows += len(table)
-                del table
+                if new_table is not None:
+                    writer.write_table(_sort_for_pushdown(new_table),
+                                       row_group_size=ROW_GROUP_SIZE)
+                    total_rows += len(new_table)
+                    del new_table
                 gc.collect()
         finally:
             if writer:
                 writer.close()
+            if existing_pf is not None:
+                existing_pf.close()
             _cleanup_temp_dir(temp_dir)
 
         if total_rows == 0:
@@ -22,58 +22,123 @@ Data extracted:
 - fixtures: Match fixtures with scores and statuses
 """
 
+import gzip
 import os
 import requests
 import json
 import re
 import time
 import random
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass, fields
 import pandas as pd
+import pyarrow as pa
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 
 
-@dataclass
-class Shot:
-    """Represents a shot event extracted from player stats (aggregated per player-match)"""
-    match_id: str
-    player_id: str
-    player_name: str
-    team_id: str
-    team_name: str
-    position: str
-    minutes_played: int
+# Aggregated per player-match shot columns for extract_player_shots(), as
+# (output column, Opta stat type) in output order. goals_inside_box and
+# shots_penalty need more than one stat and are filled in separately.
+SHOT_STAT_COLUMNS = (
     # Shot counts by type
-    total_shots: int = 0
-    shots_on_target: int = 0
-    shots_off_target: int = 0
-    shots_blocked: int = 0
+    ("total_shots", "totalScoringAtt"),
+    ("shots_on_target", "ontargetScoringAtt"),
+    ("shots_off_target", "shotOffTarget"),
+    ("shots_blocked", "blockedScoringAtt"),
     # Location
-    shots_inside_box: int = 0
-    shots_outside_box: int = 0
-    shots_box_centre: int = 0
-    shots_box_left: int = 0
-    shots_box_right: int = 0
+    ("shots_inside_box", "attemptsIbox"),
+    ("shots_outside_box", "attemptsObox"),
+    ("shots_box_centre", "attBxCentre"),
+    ("shots_box_left", "attBxLeft"),
+    ("shots_box_right", "attBxRight"),
     # Body part
-    shots_right_foot: int = 0
-    shots_left_foot: int = 0
-    shots_header: int = 0
+    ("shots_right_foot", "attRfTotal"),
+    ("shots_left_foot", "attLfTotal"),
+    ("shots_header", "attHdTotal"),
     # Outcomes
-    goals: int = 0
-    goals_inside_box: int = 0
+    ("goals", "goals"),
+    ("goals_inside_box", None),
     # Shot type
-    shots_open_play: int = 0
-    shots_corner: int = 0
-    shots_penalty: int = 0
+    ("shots_open_play", "attOpenplay"),
+    ("shots_corner", "attCorner"),
+    ("shots_penalty", None),
     # Big chances
-    big_chance_created: int = 0
-    big_chance_missed: int = 0
-    big_chance_scored: int = 0
+    ("big_chance_created", "bigChanceCreated"),
+    ("big_chance_missed", "bigChanceMissed"),
+    ("big_chance_scored", "bigChanceScored"),
+)
+
+
+# Stat types _shot_row() reads: the one-to-one columns above, plus the ones
+# behind minutes_played and the two composite columns
+_SHOT_STAT_TYPES = frozenset(
+    [stat for _, stat in SHOT_STAT_COLUMNS if stat]
+    + ["minsPlayed", "goalsIbox", "attIboxGoal", "attPenGoal", "attPenMiss"])
+
+# Arrow schema of extract_player_shots() rows. Every stat is an int
+# (missing stats default to 0), so rows can be written without pandas'
+# per-column type inference.
+SHOT_SCHEMA = pa.schema(
+    [(c, pa.string()) for c in ("match_id", "player_id", "player_name",
+                                "team_id", "team_name", "position")]
+    + [("minutes_played", pa.int64())]
+    + [(column, pa.int64()) for column, _ in SHOT_STAT_COLUMNS]
+)
+
+
+# json.dumps(..., separators=(",", ":")) builds a new encoder on every call
+# with non-default arguments; extract_all_match_events calls it per event
+_compact_json = json.JSONEncoder(separators=(",", ":")).encode
+
+# Opta shot event type IDs: 13=miss, 14=post, 15=attempt saved, 16=goal
+SHOT_TYPE_IDS = frozenset((13, 14, 15, 16))
+
+# The only player stats extract_lineups() reads
+_LINEUP_STATS = frozenset(("minsPlayed", "gameStarted"))
+
+# Raw API payloads are cached as data/raw/{league}/{season}/{match_id}_{kind}
+# + RAW_JSON_SUFFIX, kind being "stats" or "events", zstd-compressed through
+# pyarrow's codec. Older runs wrote .json.gz or plain .json, which readers
+# still accept; RAW_JSON_SUFFIXES lists them in order of preference.
+RAW_JSON_SUFFIX = ".json.zst"
+RAW_JSON_SUFFIXES = (RAW_JSON_SUFFIX, ".json.gz", ".json")
+_RAW_JSON_CODEC = pa.Codec("zstd", compression_level=3)
 
 
-@dataclass
+def find_raw_json(raw_dir: Path, match_id: str, kind: str) -> Optional[Path]:
+    """Return the cached raw payload path for a match, or None.
+
+    Prefers the current zstd file; falls back to one from an older run.
+    """
+    for suffix in RAW_JSON_SUFFIXES:
+        path = raw_dir / f"{match_id}_{kind}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def read_raw_json(path: Path) -> Dict:
+    """Load a raw payload, zstd, gzipped or plain, by file suffix."""
+    if path.suffix == ".zst":
+        with pa.input_stream(str(path), compression="zstd") as f:
+            return json.loads(f.read())
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
 class ShotEvent:
     """Represents an individual shot event with x/y coordinates"""
     match_id: str
@@ -100,7 +165,7 @@ class ShotEvent:
     goalmouth_z: float = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AllMatchEvent:
     """Represents any match event with x/y coordinates from matchevent API.
 
@@ -183,7 +248,7 @@ class AllMatchEvent:
     qualifier_json: str = ""  # Full qualifiers as JSON string for advanced analysis
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchEvent:
     """Represents a match event (goal, card, substitution) with timing"""
     match_id: str
@@ -203,7 +268,7 @@ class MatchEvent:
     assist_player_name: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerLineup:
     """Represents a player's lineup info with minutes played"""
     match_id: str
@@ -223,6 +288,64 @@ class PlayerLineup:
     sub_off_minute: int = 0
 
 
+@lru_cache(maxsize=None)
+def _field_names(cls) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def as_rows(records: List[Any]) -> List[Dict]:
+    """Row dicts for a list of one record dataclass, the same dicts
+    `dataclasses.asdict` would return.
+
+    The records are flat, so asdict's recursive deep copy buys nothing and
+    costs ~14x a plain attribute read (~30 ms per match of AllMatchEvents).
+    """
+    if not records:
+        return []
+    names = _field_names(type(records[0]))
+    return [{name: getattr(r, name) for name in names} for r in records]
+
+
+def _browser_headers(ua: str) -> Dict[str, str]:
+    """Headers a real browser with User-Agent ua sends to the API."""
+    # Determine browser type from User-Agent for sec-ch-ua
+    if "Edg/" in ua:
+        sec_ch_ua = '"Microsoft Edge";v="120", "Chromium";v="120", "Not-A.Brand";v="24"'
+    elif "Firefox" in ua:
+        sec_ch_ua = None  # Firefox doesn't send sec-ch-ua
+    elif "Safari" in ua and "Chrome" not in ua:
+        sec_ch_ua = None  # Safari doesn't send sec-ch-ua
+    else:
+        # Chrome
+        sec_ch_ua = '"Google Chrome";v="120", "Chromium";v="120", "Not-A.Brand";v="24"'
+
+    headers = {
+        "User-Agent": ua,
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Language": "en-US,en;q=0.9",
+        # Only the codings urllib3 can decode here ("br" needs the
+        # optional brotli package): a br body it can't decode would fail
+        # resp.json() on every retry
+        "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING,
+        "Referer": "https://theanalyst.com/",
+        "Origin": "https://theanalyst.com",
+        "Connection": "keep-alive",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+    }
+
+    # Add Chromium-specific headers
+    if sec_ch_ua:
+        headers["sec-ch-ua"] = sec_ch_ua
+        headers["sec-ch-ua-mobile"] = "?0"
+        headers["sec-ch-ua-platform"] = '"Windows"' if "Windows" in ua else '"macOS"'
+        headers["Sec-Fetch-Dest"] = "empty"
+        headers["Sec-Fetch-Mode"] = "cors"
+        headers["Sec-Fetch-Site"] = "cross-site"
+
+    return headers
+
+
 class OptaScraper:
     """Scrapes Opta data from TheAnalyst API"""
 
@@ -231,6 +354,8 @@ class OptaScraper:
     # set as a GitHub Actions secret); falls back to the public default so the
     # scrape works whether or not the secret is configured.
     PROVIDER_ID = os.environ.get("OPTA_OUTLET_ID") or "1mjq6w6ezkxe611ykkj8rgz7f1"
+    # Query params sent with every request (callers' params take precedence)
+    DEFAULT_PARAMS = MappingProxyType({"_rt": "c", "_fmt": "json"})
 
     # Rotating User-Agent pool to help prevent rate limiting
     # Mimics various browsers on Windows/Mac for realistic traffic patterns
@@ -255,8 +380,12 @@ class OptaScraper:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
     ]
 
-    # Competition IDs - Organized by importance/priority
-    COMPETITIONS = {
+    # Full header set per User-Agent, built once
+    BROWSER_HEADERS = tuple(_browser_headers(ua) for ua in USER_AGENTS)
+
+    # Competition IDs - Organized by importance/priority. Read-only, like
+    # DEFAULT_PARAMS: instances share the one class-level table.
+    COMPETITIONS = MappingProxyType({
         # ===========================================
         # TIER 1: Big 5 European Leagues
         # ===========================================
@@ -445,7 +574,7 @@ class OptaScraper:
         "Azerbaijan_Premier": "3428tckxcirwwh3o3jgc1m8ji",
         "Kazakhstan_Premier": "9ikchyu9fb8bvx0s673jofj6s",
         "Azerbaijan_Cup": "9gvvndi7vk9fzvpe65pv5x2ir",
-    }
+    })
 
     # Known season IDs (will be populated by discover_seasons)
     SEASONS = {
@@ -464,52 +593,92 @@ class OptaScraper:
         "Ligue_1_2025-2026": "dbxs75cag7zyip5re0ppsanmc",
     }
 
-    def __init__(self, data_dir: str = "data"):
+    # Raw JSON younger than this is reused by fetch_matches() instead of
+    # re-requested. Long enough to cover a rerun after a crashed scrape,
+    # short enough that the next daily run re-fetches matches whose feeds
+    # were still incomplete.
+    RAW_CACHE_MAX_AGE = timedelta(hours=12)
+    # ...except for a Played match whose raw JSON was fetched at least this
+    # long after match day: past Opta's post-match corrections, the payload
+    # can't change any more, so it is reused however old it is.
+    RAW_CACHE_SETTLED_AFTER = timedelta(days=7)
+
+    def __init__(self, data_dir: str = "data", max_workers: int = 1):
+        """
+        Args:
+            data_dir: Directory for raw JSON and processed parquet output
+            max_workers: Concurrent match fetches in fetch_matches(). The
+                rate limiter admits this many requests per delay window, so
+                1 keeps the original one-request-per-1-2s pacing.
+        """
+        self.max_workers = max(1, max_workers)
         self.session = requests.Session()
+        # Every request goes to one host, so one connection pool holding a
+        # keep-alive connection per worker: concurrent GETs neither queue on
+        # nor churn (re-handshake) a single connection. Retries stay in
+        # _fetch_raw, which logs them and knows which statuses are final.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         # Set comprehensive browser headers to mimic real browser traffic
         self._set_random_headers()
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self._request_count = 0
-        self._last_request_time = 0
+        # Start times of the last max_workers requests (sliding window)
+        self._request_times = deque(maxlen=self.max_workers)
+        # Set on HTTP 429: no worker starts a request before this time
+        self._pause_until = 0.0
+        self._rate_lock = threading.Lock()
+        # Season IDs found by earlier discover_seasons() runs override the
+        # hard-coded class table, which goes stale as new seasons start
+        self.SEASONS = {**self.SEASONS, **self._load_seasons_cache()}
+
+    @property
+    def _seasons_cache_path(self) -> Path:
+        # Same file and {competition: {season: id}} layout discover_seasons.py writes
+        return self.data_dir / "seasons.json"
+
+    def _load_seasons_cache(self) -> Dict[str, str]:
+        """Return cached season IDs as {"{competition}_{season}": id}."""
+        try:
+            cached = json.loads(self._seasons_cache_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: ignoring unreadable season cache {self._seasons_cache_path}: {e}")
+            return {}
+        return {f"{comp}_{name}": season_id
+                for comp, seasons in cached.items()
+                for name, season_id in seasons.items()}
 
-    def _set_random_headers(self):
-        """Set randomized browser headers to help prevent rate limiting"""
-        ua = random.choice(self.USER_AGENTS)
-
-        # Determine browser type from User-Agent for sec-ch-ua
-        if "Edg/" in ua:
-            sec_ch_ua = '"Microsoft Edge";v="120", "Chromium";v="120", "Not-A.Brand";v="24"'
-        elif "Firefox" in ua:
-            sec_ch_ua = None  # Firefox doesn't send sec-ch-ua
-        elif "Safari" in ua and "Chrome" not in ua:
-            sec_ch_ua = None  # Safari doesn't send sec-ch-ua
-        else:
-            # Chrome
-            sec_ch_ua = '"Google Chrome";v="120", "Chromium";v="120", "Not-A.Brand";v="24"'
-
-        headers = {
-            "User-Agent": ua,
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Referer": "https://theanalyst.com/",
-            "Origin": "https://theanalyst.com",
-            "Connection": "keep-alive",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        }
+    def _save_seasons_cache(self, competition: str, seasons: Dict[str, str]):
+        """Merge one competition's discovered seasons into the cache file.
 
-        # Add Chromium-specific headers
-        if sec_ch_ua:
-            headers["sec-ch-ua"] = sec_ch_ua
-            headers["sec-ch-ua-mobile"] = "?0"
-            headers["sec-ch-ua-platform"] = '"Windows"' if "Windows" in ua else '"macOS"'
-            headers["Sec-Fetch-Dest"] = "empty"
-            headers["Sec-Fetch-Mode"] = "cors"
-            headers["Sec-Fetch-Site"] = "cross-site"
+        Written via a temp file + rename so a concurrent reader never sees a
+        partial file.
+        """
+        path = self._seasons_cache_path
+        try:
+            cached = json.loads(path.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            cached = {}
+        cached[competition] = {**cached.get(competition, {}), **seasons}
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(cached, f, indent=2)
+            tmp.replace(path)
+        except OSError as e:
+            print(f"Warning: could not update season cache {path}: {e}")
 
-        self.session.headers.update(headers)
+    def _set_random_headers(self):
+        """Set randomized browser headers to help prevent rate limiting"""
+        # Swap in a whole new headers dict rather than mutating the live one,
+        # so a request being prepared on another thread never sees it
+        # mid-update, and no Chromium-only header outlives a switch to a
+        # Firefox/Safari User-Agent
+        self.session.headers = CaseInsensitiveDict(random.choice(self.BROWSER_HEADERS))
 
     def _rate_limit(self, min_delay: float = 1.0, max_delay: float = 2.0):
         """Rate limiting with User-Agent rotation and randomized delays.
@@ -518,22 +687,71 @@ class OptaScraper:
             min_delay: Minimum delay between requests in seconds
             max_delay: Maximum delay between requests in seconds
         """
-        # Add random jitter to delay to make request pattern less predictable
-        delay = random.uniform(min_delay, max_delay)
-        elapsed = time.time() - self._last_request_time
-        if elapsed < delay:
-            time.sleep(delay - elapsed)
-        self._last_request_time = time.time()
-        self._request_count += 1
-
-        # Rotate User-Agent every 10 requests to vary traffic pattern
-        if self._request_count % 10 == 0:
-            self._set_random_headers()
+        # Reserve a start slot under the lock, then sleep outside it so other
+        # threads can reserve theirs. A request may start once the oldest of
+        # the last max_workers requests is `delay` old: at most max_workers
+        # requests per window, overlapping each other's network latency.
+        with self._rate_lock:
+            # Add random jitter to delay to make request pattern less predictable
+            delay = random.uniform(min_delay, max_delay)
+            now = time.monotonic()
+            start = max(now, self._pause_until)
+            if len(self._request_times) == self._request_times.maxlen:
+                start = max(start, self._request_times[0] + delay)
+            self._request_times.append(start)
+            self._request_count += 1
+
+            # Rotate User-Agent every 10 requests to vary traffic pattern
+            if self._request_count % 10 == 0:
+                self._set_random_headers()
+
+        if start > now:
+            time.sleep(start - now)
+
+    def _pause_requests(self, wait: float):
+        """Hold back every worker's next request for wait seconds.
+
+        A 429 means the API is throttling this client, not one request, so
+        the other workers must not keep firing into the limit meanwhile.
+        """
+        with self._rate_lock:
+            self._pause_until = max(self._pause_until, time.monotonic() + wait)
+
+    @staticmethod
+    def _retry_after(resp) -> Optional[float]:
+        """Seconds to wait from a Retry-After header, capped at 5 minutes.
+
+        Handles both the delay-seconds and HTTP-date forms; None when the
+        header is missing or unparseable.
+        """
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            wait = float(value)
+        except ValueError:
+            try:
+                wait = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(wait, 0.0), 300.0)
 
     def _fetch_raw(self, endpoint: str, params: Dict[str, str],
                    max_retries: int = 3) -> Tuple[Optional[Dict], int]:
         """Fetch from API and return (data, last_http_status).
 
+        See _fetch_body, which this wraps, dropping the response body.
+        """
+        data, status, _ = self._fetch_body(endpoint, params, max_retries)
+        return data, status
+
+    def _fetch_body(self, endpoint: str, params: Dict[str, str],
+                    max_retries: int = 3) -> Tuple[Optional[Dict], int, Optional[bytes]]:
+        """Fetch from API and return (data, last_http_status, body).
+
+        body is the raw response bytes that data was parsed from (None
+        whenever data is None), for callers that save the payload as-is.
+
         Status is the HTTP code last observed (or 0 for network/JSON errors
         that never produced a response). Useful for callers that need to
         distinguish 404 ("resource doesn't exist") from other None causes
@@ -544,8 +762,7 @@ class OptaScraper:
         Returns (None, status) on permanent failures (400, 403, 404).
         """
         url = f"{self.BASE_URL}/{endpoint}"
-        default_params = {"_rt": "c", "_fmt": "json"}
-        all_params = {**default_params, **params}
+        all_params = self.DEFAULT_PARAMS | params
 
         for attempt in range(1, max_retries + 1):
             self._rate_limit()
@@ -556,23 +773,32 @@ class OptaScraper:
                 if resp.status_code in (400, 403, 404):
                     if resp.status_code != 404:
                         print(f"Request failed for {endpoint}: HTTP {resp.status_code}")
-                    return None, resp.status_code
+                    return None, resp.status_code, None
 
-                # Rate limited or server error - retry with backoff
+                # Rate limited or server error - retry with backoff, for as
+                # long as the server asks when it says
                 if resp.status_code == 429 or resp.status_code >= 500:
                     if attempt < max_retries:
-                        wait = 2 ** attempt + random.uniform(0, 1)
+                        wait = self._retry_after(resp)
+                        if wait is None:
+                            wait = 2 ** attempt + random.uniform(0, 1)
                         print(f"HTTP {resp.status_code} for {endpoint} "
                               f"(attempt {attempt}/{max_retries}), retrying in {wait:.1f}s...")
-                        time.sleep(wait)
+                        if resp.status_code == 429:
+                            # _rate_limit sleeps this worker and the others
+                            self._pause_requests(wait)
+                        else:
+                            time.sleep(wait)
                         continue
                     else:
                         print(f"Request failed for {endpoint}: HTTP {resp.status_code} "
                               f"after {max_retries} attempts")
-                        return None, resp.status_code
+                        return None, resp.status_code, None
 
                 resp.raise_for_status()
-                return resp.json(), resp.status_code
+                # resp.json() honours a declared non-UTF-8 charset; the raw
+                # bytes are kept as-is for the payload cache
+                return resp.json(), resp.status_code, resp.content
 
             except (requests.ConnectionError, requests.Timeout) as e:
                 if attempt < max_retries:
@@ -582,7 +808,7 @@ class OptaScraper:
                     time.sleep(wait)
                 else:
                     print(f"Request failed for {endpoint} after {max_retries} attempts: {e}")
-                    return None, 0
+                    return None, 0, None
             except requests.RequestException as e:
                 if attempt < max_retries:
                     wait = 2 ** attempt + random.uniform(0, 1)
@@ -591,8 +817,8 @@ class OptaScraper:
                     time.sleep(wait)
                 else:
                     print(f"Request failed for {endpoint} after {max_retries} attempts: {e}")
-                    return None, 0
-            except json.JSONDecodeError as e:
+                    return None, 0, None
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
                 if attempt < max_retries:
                     wait = 2 ** attempt + random.uniform(0, 1)
                     print(f"JSON parse error for {endpoint} "
@@ -600,9 +826,9 @@ class OptaScraper:
                     time.sleep(wait)
                 else:
                     print(f"JSON parse failed for {endpoint} after {max_retries} attempts: {e}")
-                    return None, 0
+                    return None, 0, None
 
-        return None, 0  # Safety fallback (all paths return inside the loop)
+        return None, 0, None  # Safety fallback (all paths return inside the loop)
 
     def _fetch(self, endpoint: str, params: Dict[str, str],
                max_retries: int = 3) -> Optional[Dict]:
@@ -624,11 +850,11 @@ class OptaScraper:
         Returns:
             Dict mapping season names to season IDs
         """
-        if competition not in self.COMPETITIONS:
+        comp_id = self.COMPETITIONS.get(competition)
+        if comp_id is None:
             print(f"Unknown competition: {competition}")
             return {}
 
-        comp_id = self.COMPETITIONS[competition]
         endpoint = f"tournamentcalendar/{self.PROVIDER_ID}"
         params = {"comp": comp_id}
 
@@ -763,17 +989,140 @@ class OptaScraper:
 
         return all_matches
 
+    def _match_stats_request(self, match_id: str) -> Tuple[str, Dict[str, str]]:
+        return f"matchstats/{self.PROVIDER_ID}/{match_id}", {"detailed": "yes", "_lcl": "en"}
+
+    def _match_events_request(self, match_id: str) -> Tuple[str, Dict[str, str]]:
+        return f"matchevent/{self.PROVIDER_ID}/{match_id}", {}
+
     def get_match_stats(self, match_id: str) -> Optional[Dict]:
         """Get detailed match statistics including player stats"""
-        endpoint = f"matchstats/{self.PROVIDER_ID}/{match_id}"
-        params = {"detailed": "yes", "_lcl": "en"}
-        return self._fetch(endpoint, params)
+        return self._fetch(*self._match_stats_request(match_id))
 
     def get_match_events(self, match_id: str) -> Optional[Dict]:
         """Get event-level data with x/y coordinates for all match events"""
-        endpoint = f"matchevent/{self.PROVIDER_ID}/{match_id}"
-        params = {}
-        return self._fetch(endpoint, params)
+        return self._fetch(*self._match_events_request(match_id))
+
+    def _load_cached_match(self, match_id: str,
+                           raw_dir: Path) -> Optional[Tuple[Dict, Dict]]:
+        """Return (stats, event_data) from fresh or settled raw JSON, or None.
+
+        Only a match with both files cached counts. A match without an
+        events file had its feed missing last time and is worth asking the
+        API about again.
+        """
+        cutoff = time.time() - self.RAW_CACHE_MAX_AGE.total_seconds()
+        try:
+            paths = [find_raw_json(raw_dir, match_id, kind) for kind in ("stats", "events")]
+            if any(p is None for p in paths):
+                return None
+            written = min(p.stat().st_mtime for p in paths)
+            stats, event_data = (read_raw_json(p) for p in paths)
+        except (OSError, EOFError, zlib.error, ValueError):
+            return None
+        if not stats or not event_data:
+            return None
+        if written < cutoff and not self._is_settled(stats, written):
+            return None
+        return stats, event_data
+
+    @classmethod
+    def _is_settled(cls, stats: Dict, written: float) -> bool:
+        """True when a Played match's payload was fetched (written, epoch
+        seconds) at least RAW_CACHE_SETTLED_AFTER after its match date."""
+        details = stats.get("liveData", {}).get("matchDetails", {})
+        if details.get("matchStatus") != "Played":
+            return False
+        try:
+            match_day = datetime.strptime(stats["matchInfo"]["date"][:10], "%Y-%m-%d")
+        except (KeyError, TypeError, ValueError):
+            return False
+        settled = match_day.replace(tzinfo=timezone.utc) + cls.RAW_CACHE_SETTLED_AFTER
+        return written >= settled.timestamp()
+
+    @staticmethod
+    def _write_raw_json(raw_dir: Path, match_id: str, kind: str, body: bytes):
+        """Write one zstd-compressed raw payload via a temp file + rename, so
+        a crash mid-write never leaves a truncated file for the cache to pick
+        up. Copies in older formats are removed.
+
+        body is the API response as received, so nothing is re-encoded.
+        zstd level 3 beats gzip level 1 on these event payloads: ~20% smaller
+        and ~3x faster to compress.
+        """
+        path = raw_dir / f"{match_id}_{kind}{RAW_JSON_SUFFIX}"
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(_RAW_JSON_CODEC.compress(body, asbytes=True))
+        tmp.replace(path)
+        for suffix in RAW_JSON_SUFFIXES[1:]:
+            (raw_dir / f"{match_id}_{kind}{suffix}").unlink(missing_ok=True)
+
+    def _fetch_match(self, match_id: str, raw_dir: Optional[Path] = None,
+                     force_refresh: bool = False) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Fetch matchstats then matchevent for one match.
+
+        The event feed is only requested when stats came back. When raw_dir
+        is given, fresh cached raw JSON there is used instead of the API
+        (unless force_refresh), and fetched JSON is written back from the
+        worker thread.
+        """
+        if raw_dir is not None and not force_refresh:
+            cached = self._load_cached_match(match_id, raw_dir)
+            if cached is not None:
+                return cached
+
+        # Same requests as get_match_stats/get_match_events, keeping the
+        # response bytes so the raw cache needn't re-encode the payloads
+        stats, _, stats_body = self._fetch_body(*self._match_stats_request(match_id))
+        if not stats:
+            return None, None
+        event_data, _, events_body = self._fetch_body(*self._match_events_request(match_id))
+
+        if raw_dir is not None:
+            try:
+                raw_dir.mkdir(parents=True, exist_ok=True)
+                self._write_raw_json(raw_dir, match_id, "stats", stats_body)
+                if event_data:
+                    self._write_raw_json(raw_dir, match_id, "events", events_body)
+            except OSError as e:
+                print(f"Warning: failed to write raw JSON for match {match_id}: {e}")
+        return stats, event_data
+
+    def fetch_matches(self, match_ids: List[str], raw_dir: Optional[Path] = None,
+                      force_refresh: bool = False):
+        """Fetch stats + events for many matches on max_workers threads.
+
+        Yields (match_id, stats, event_data) in input order, so callers can
+        extract and print progress as each match arrives while later matches
+        are still in flight. Request pacing is enforced by _rate_limit;
+        matches served from the raw JSON cache use no request slot.
+
+        At most 2 * max_workers matches are fetched ahead of the caller, so
+        finished multi-MB payloads don't pile up in memory when extraction
+        is slower than the API.
+        """
+        fetch = partial(self._fetch_match, raw_dir=raw_dir, force_refresh=force_refresh)
+        if self.max_workers == 1:
+            for match_id in match_ids:
+                yield (match_id, *fetch(match_id))
+            return
+
+        window = 2 * self.max_workers
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for match_id in match_ids:
+                    pending.append((match_id, executor.submit(fetch, match_id)))
+                    if len(pending) >= window:
+                        done_id, future = pending.popleft()
+                        yield (done_id, *future.result())
+                while pending:
+                    done_id, future = pending.popleft()
+                    yield (done_id, *future.result())
+            finally:
+                # Caller stopped early (or raised): drop queued fetches
+                for _, future in pending:
+                    future.cancel()
 
     def get_possession(self, match_id: str) -> Optional[Dict]:
         """Get possession statistics"""
@@ -787,8 +1136,12 @@ class OptaScraper:
         params = {}
         return self._fetch(endpoint, params)
 
-    def extract_player_shots(self, match_data: Dict) -> List[Shot]:
-        """Extract shot data from match stats for xG model"""
+    def extract_player_shots(self, match_data: Dict) -> List[Dict]:
+        """Extract shot data from match stats for xG model.
+
+        Returns one row dict per player with at least one shot, with the
+        columns of SHOT_STAT_COLUMNS after the player/team identifiers.
+        """
         shots = []
 
         match_id = match_data.get("matchInfo", {}).get("id", "")
@@ -805,62 +1158,74 @@ class OptaScraper:
             team_name = team_map.get(team_id, "Unknown")
 
             for player in lineup.get("player", []):
-                player_id = player.get("playerId", "")
-                player_name = player.get("matchName", "")
-                position = player.get("position", "")
-
-                # Convert stats list to dict for easier access
-                stats = {}
+                row = {
+                    "match_id": match_id,
+                    "player_id": player.get("playerId", ""),
+                    "player_name": player.get("matchName", ""),
+                    "team_id": team_id,
+                    "team_name": team_name,
+                    "position": player.get("position", ""),
+                }
+                # Keep only the stats a shot row reads (players carry ~200
+                # stat types); _shot_row maps them as for full stat rows
                 missing_type = 0
                 for s in player.get("stat", []):
-                    if "type" not in s:
+                    stat_type = s.get("type")
+                    if stat_type is None:
                         missing_type += 1
-                        continue
-                    stats[s["type"]] = int(s.get("value", 0))
+                    elif stat_type in _SHOT_STAT_TYPES:
+                        row[stat_type] = s.get("value", 0)
                 if missing_type > 0:
-                    print(f"  Warning: {missing_type} stat entries missing 'type' for player {player_name} in match {match_id}")
+                    print(f"  Warning: {missing_type} stat entries missing 'type' for player {row['player_name']} in match {match_id}")
 
                 # Only include players who took shots
-                total_shots = stats.get("totalScoringAtt", 0)
-                if total_shots == 0:
-                    continue
-
-                shot = Shot(
-                    match_id=match_id,
-                    player_id=player_id,
-                    player_name=player_name,
-                    team_id=team_id,
-                    team_name=team_name,
-                    position=position,
-                    minutes_played=stats.get("minsPlayed", 0),
-                    total_shots=total_shots,
-                    shots_on_target=stats.get("ontargetScoringAtt", 0),
-                    shots_off_target=stats.get("shotOffTarget", 0),
-                    shots_blocked=stats.get("blockedScoringAtt", 0),
-                    shots_inside_box=stats.get("attemptsIbox", 0),
-                    shots_outside_box=stats.get("attemptsObox", 0),
-                    shots_box_centre=stats.get("attBxCentre", 0),
-                    shots_box_left=stats.get("attBxLeft", 0),
-                    shots_box_right=stats.get("attBxRight", 0),
-                    shots_right_foot=stats.get("attRfTotal", 0),
-                    shots_left_foot=stats.get("attLfTotal", 0),
-                    shots_header=stats.get("attHdTotal", 0),
-                    goals=stats.get("goals", 0),
-                    # Note: goalsIbox or attIboxGoal both work for goals inside box
-                    goals_inside_box=stats.get("goalsIbox", stats.get("attIboxGoal", 0)),
-                    shots_open_play=stats.get("attOpenplay", 0),
-                    shots_corner=stats.get("attCorner", 0),
-                    shots_penalty=stats.get("attPenGoal", 0) + stats.get("attPenMiss", 0),
-                    big_chance_created=stats.get("bigChanceCreated", 0),
-                    big_chance_missed=stats.get("bigChanceMissed", 0),
-                    big_chance_scored=stats.get("bigChanceScored", 0),
-                )
-                shots.append(shot)
+                if int(row.get("totalScoringAtt", 0)):
+                    shots.append(self._shot_row(row))
 
         return shots
 
+    def extract_player_stats_and_shots(self, match_data: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """Extract player stat rows and shot rows in one pass over the stats.
+
+        Returns (extract_player_stats_rows(), extract_player_shots()) for the
+        match. The shot rows are derived from the already-parsed player rows,
+        so each player's ~200 stat entries are walked once, not twice.
+        """
+        rows = self.extract_player_stats_rows(match_data)
+        return rows, [self._shot_row(row) for row in rows
+                      if row.get("totalScoringAtt", 0)]
+
+    @staticmethod
+    def _shot_row(player_row: Dict) -> Dict:
+        """Build an extract_player_shots() row from a player stats row."""
+        shot = {
+            "match_id": player_row["match_id"],
+            "player_id": player_row["player_id"],
+            "player_name": player_row["player_name"],
+            "team_id": player_row["team_id"],
+            "team_name": player_row["team_name"],
+            "position": player_row["position"],
+            "minutes_played": int(player_row.get("minsPlayed", 0)),
+        }
+        for column, stat_type in SHOT_STAT_COLUMNS:
+            shot[column] = int(player_row.get(stat_type, 0)) if stat_type else 0
+        # Note: goalsIbox or attIboxGoal both work for goals inside box
+        shot["goals_inside_box"] = int(player_row.get("goalsIbox", player_row.get("attIboxGoal", 0)))
+        shot["shots_penalty"] = int(player_row.get("attPenGoal", 0)) + int(player_row.get("attPenMiss", 0))
+        return shot
+
     def extract_all_player_stats(self, match_data: Dict) -> pd.DataFrame:
         """Extract full player stats from match data as DataFrame"""
+        return pd.DataFrame(self.extract_player_stats_rows(match_data))
+
+    def extract_player_stats_rows(self, match_data: Dict) -> List[Dict]:
+        """Extract full player stats from match data as one dict per player.
+
+        Season scrapes accumulate these rows across matches and build a
+        single DataFrame at the end. That is much cheaper than a ~36-row,
+        ~250-column DataFrame per match followed by a concat that has to
+        reconcile every frame's columns.
+        """
         rows = []
 
         match_id = match_data.get("matchInfo", {}).get("id", "")
@@ -924,7 +1289,7 @@ class OptaScraper:
 
                 rows.append(row)
 
-        return pd.DataFrame(rows)
+        return rows
 
     @staticmethod
     def _parse_event_minute(event_dict: Dict) -> tuple:
@@ -1009,17 +1374,23 @@ class OptaScraper:
 
         return events
 
+    @staticmethod
+    def _goalmouth_coord(value) -> Optional[float]:
+        """Coerce a goal-mouth qualifier to float only when present;
+        absent/blank -> None (NaN downstream), never 0."""
+        if value in (None, ""):
+            return None
+        # Opta sometimes returns European-locale decimals ("49,8").
+        return float(value.replace(",", ".") if isinstance(value, str) else value)
+
     def extract_shot_events(self, event_data: Dict) -> List[ShotEvent]:
         """Extract individual shot events with x/y coordinates from matchevent data"""
         shots = []
         match_id = event_data.get("matchInfo", {}).get("id", "")
 
-        # Shot type IDs in Opta: 13=miss, 14=post, 15=attempt saved, 16=goal
-        shot_type_ids = {13, 14, 15, 16}
-
         for event in event_data.get("liveData", {}).get("event", []):
             type_id = event.get("typeId")
-            if type_id not in shot_type_ids:
+            if type_id not in SHOT_TYPE_IDS:
                 continue
 
             # Extract qualifiers
@@ -1058,16 +1429,9 @@ class OptaScraper:
             # Big chance (qualifier 214)
             big_chance = 214 in qualifiers
 
-            # Goal-mouth placement (q102=y, q103=z). Coerce to float only when
-            # present; absent/blank -> None (NaN downstream), never 0.
-            def _gm(qid):
-                v = qualifiers.get(qid)
-                if v in (None, ""):
-                    return None
-                # Opta sometimes returns European-locale decimals ("49,8").
-                return float(v.replace(",", ".") if isinstance(v, str) else v)
-            goalmouth_y = _gm(102)
-            goalmouth_z = _gm(103)
+            # Goal-mouth placement (q102=y, q103=z)
+            goalmouth_y = self._goalmouth_coord(qualifiers.get(102))
+            goalmouth_z = self._goalmouth_coord(qualifiers.get(103))
 
             shots.append(ShotEvent(
                 match_id=match_id,
@@ -1111,19 +1475,17 @@ class OptaScraper:
             if type_id is None:
                 continue
 
-            # Extract qualifiers for end coordinates (passEndX=140, passEndY=141)
-            qualifiers = {q.get("qualifierId"): q.get("value")
-                         for q in event.get("qualifier", [])}
+            # Qualifiers keyed by str(qualifierId), the form qualifier_json
+            # stores, so one dict serves both the lookups and the dump
+            qualifiers = {str(q.get("qualifierId")): q.get("value")
+                          for q in event.get("qualifier", [])}
 
             # End coordinates for passes/carries
-            end_x = float(qualifiers.get(140, 0) or 0)  # passEndX
-            end_y = float(qualifiers.get(141, 0) or 0)  # passEndY
+            end_x = float(qualifiers.get("140", 0) or 0)  # passEndX
+            end_y = float(qualifiers.get("141", 0) or 0)  # passEndY
 
             # Store qualifiers as JSON string for advanced analysis
-            qualifier_json = json.dumps(
-                {str(k): v for k, v in qualifiers.items()},
-                separators=(',', ':')
-            ) if qualifiers else ""
+            qualifier_json = _compact_json(qualifiers) if qualifiers else ""
 
             events.append(AllMatchEvent(
                 match_id=match_id,
@@ -1145,9 +1507,16 @@ class OptaScraper:
 
         return events
 
-    def extract_lineups(self, match_data: Dict) -> List[PlayerLineup]:
-        """Extract lineup data with minutes played"""
+    def extract_lineups(self, match_data: Dict,
+                        player_rows: Optional[List[Dict]] = None) -> List[PlayerLineup]:
+        """Extract lineup data with minutes played.
+
+        player_rows, if given, must be extract_player_stats_rows() for the
+        same match_data; minsPlayed/gameStarted are then read from those
+        rows rather than by walking every player's stat list again.
+        """
         lineups = []
+        rows = iter(player_rows) if player_rows is not None else None
         match_id = match_data.get("matchInfo", {}).get("id", "")
         match_date = match_data.get("matchInfo", {}).get("date", "")
 
@@ -1177,8 +1546,13 @@ class OptaScraper:
             for player in lineup.get("player", []):
                 player_id = player.get("playerId", "")
 
-                # Get minutes played from stats
-                stats = {s["type"]: s.get("value", 0) for s in player.get("stat", []) if "type" in s}
+                # Get minutes played from stats (only the two stats read
+                # below are kept, not a dict of all ~200)
+                if rows is not None:
+                    stats = next(rows)
+                else:
+                    stats = {s["type"]: s.get("value", 0) for s in player.get("stat", [])
+                             if s.get("type") in _LINEUP_STATS}
                 mins_played = int(stats.get("minsPlayed", 0))
 
                 # Determine if starter:
@@ -1314,10 +1688,22 @@ class OptaScraper:
         - matchstats: Player stats (263+ columns), lineups, goals, cards, subs
         - matchevent: Event-level data with x/y coords (shots, passes, etc.)
 
+        Each non-empty table is also saved to
+        data_dir/processed/{table}/{competition}/{season}.parquet, the same
+        layout as data/opta, so one table can be read across leagues and
+        seasons as a dataset, and a re-run only replaces its own season.
+
         Returns:
             Dict with keys: player_stats, shots, shot_events, match_events, events, lineups
         """
         season_key = f"{competition}_{season}"
+        if season_key not in self.SEASONS:
+            # One tournament-calendar call, then cached for later runs
+            seasons = self.discover_seasons(competition)
+            if seasons:
+                self._save_seasons_cache(competition, seasons)
+                self.SEASONS.update({f"{competition}_{name}": season_id
+                                     for name, season_id in seasons.items()})
         if season_key not in self.SEASONS:
             print(f"Unknown season: {season_key}")
             return {}
@@ -1346,48 +1732,36 @@ class OptaScraper:
         all_events = []
         all_lineups = []
 
-        for i, match in enumerate(played_matches):
-            match_id = match["matchInfo"]["id"]
+        raw_dir = self.data_dir / "raw" / competition / season
+        fetched = self.fetch_matches([m["matchInfo"]["id"] for m in played_matches], raw_dir)
+        for i, (match, (match_id, stats, event_data)) in enumerate(zip(played_matches, fetched)):
             match_desc = match["matchInfo"]["description"]
             print(f"  [{i+1}/{len(played_matches)}] {match_desc}...", end=" ", flush=True)
 
-            # Get matchstats data (player stats, lineups, goals, cards, subs)
-            stats = self.get_match_stats(match_id)
+            # matchstats: player stats, lineups, goals, cards, subs
             if not stats:
                 print("FAILED (stats)")
                 continue
 
             # Extract from matchstats
-            player_df = self.extract_all_player_stats(stats)
-            all_player_stats.append(player_df)
-
-            shots = self.extract_player_shots(stats)
-            all_shots.extend([asdict(s) for s in shots])
+            player_rows, shots = self.extract_player_stats_and_shots(stats)
+            all_player_stats.extend(player_rows)
+            all_shots.extend(shots)
 
             events = self.extract_match_events(stats)
-            all_events.extend([asdict(e) for e in events])
+            all_events.extend(as_rows(events))
 
-            lineups = self.extract_lineups(stats)
-            all_lineups.extend([asdict(l) for l in lineups])
+            lineups = self.extract_lineups(stats, player_rows)
+            all_lineups.extend(as_rows(lineups))
 
-            # Get matchevent data (event-level with x/y coords)
-            event_data = self.get_match_events(match_id)
+            # matchevent: event-level data with x/y coords
             if event_data:
                 shot_events = self.extract_shot_events(event_data)
-                all_shot_events.extend([asdict(s) for s in shot_events])
+                all_shot_events.extend(as_rows(shot_events))
 
                 # Extract ALL events with x/y coords (passes, tackles, aerials, etc.)
                 match_events = self.extract_all_match_events(event_data)
-                all_match_events.extend([asdict(e) for e in match_events])
-
-            # Save raw JSON files
-            raw_dir = self.data_dir / "raw" / competition / season
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            with open(raw_dir / f"{match_id}_stats.json", "w") as f:
-                json.dump(stats, f)
-            if event_data:
-                with open(raw_dir / f"{match_id}_events.json", "w") as f:
-                    json.dump(event_data, f)
+                all_match_events.extend(as_rows(match_events))
 
             print("OK")
 
@@ -1395,7 +1769,7 @@ class OptaScraper:
         result = {}
 
         if all_player_stats:
-            result["player_stats"] = pd.concat(all_player_stats, ignore_index=True)
+            result["player_stats"] = pd.DataFrame(all_player_stats)
         else:
             result["player_stats"] = pd.DataFrame()
 
@@ -1424,13 +1798,15 @@ class OptaScraper:
         else:
             result["lineups"] = pd.DataFrame()
 
-        # Save processed data
-        processed_dir = self.data_dir / "processed" / competition / season
-        processed_dir.mkdir(parents=True, exist_ok=True)
+        # Save processed data, one {table}/{competition}/{season}.parquet each
+        processed_dir = self.data_dir / "processed"
 
         for name, df in result.items():
             if not df.empty:
-                df.to_parquet(processed_dir / f"{name}.parquet", index=False)
+                league_dir = processed_dir / name / competition
+                league_dir.mkdir(parents=True, exist_ok=True)
+                df.to_parquet(league_dir / f"{season}.parquet", index=False,
+                              compression="zstd", compression_level=3)
                 print(f"Saved {name}: {len(df)} rows")
 
         return result
@@ -57,7 +57,7 @@ import pandas as pd
 import pyarrow.parquet as pq
 
 # Reuse the production scraper for the matchevent endpoint + parsing.
-from opta_scraper import OptaScraper
+from opta_scraper import OptaScraper, as_rows
 
 
 @dataclass
@@ -287,8 +287,8 @@ def rebuild_events_for_league(
             error_ids.append(mid)
             continue
 
-        accumulated_match_events.extend([asdict(e) for e in match_events])
-        accumulated_shot_events.extend([asdict(s) for s in shot_events])
+        accumulated_match_events.extend(as_rows(match_events))
+        accumulated_shot_events.extend(as_rows(shot_events))
         n_succeeded += 1
         print(f"OK ({len(match_events)} events, {len(shot_events)} shot_events)")
 
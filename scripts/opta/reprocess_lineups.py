@@ -1,7 +1,8 @@
 """
 Reprocess cached Opta JSON to fix lineup minutes and event timing.
 
-Reads cached raw JSON from data/raw/{league}/{season}/*_stats.json,
+Reads cached raw JSON from data/raw/{league}/{season}/*_stats.json.zst (or
+the legacy .json.gz / .json copies from older runs),
 re-extracts lineups and events using the fixed scraper methods,
 and overwrites the affected parquet files.
 
@@ -13,14 +14,13 @@ Usage:
 """
 
 import argparse
-import json
 import sys
+import zlib
 from pathlib import Path
-from dataclasses import asdict
 
 import pandas as pd
 
-from opta_scraper import OptaScraper
+from opta_scraper import OptaScraper, RAW_JSON_SUFFIXES, as_rows, read_raw_json
 
 
 def get_raw_dir() -> Path:
@@ -38,7 +38,12 @@ def reprocess_season(scraper: OptaScraper, league: str, season: str,
     if not season_raw.exists():
         return {"skipped": True, "reason": "no raw dir"}
 
-    stats_files = sorted(season_raw.glob("*_stats.json"))
+    # One file per match, preferring the current format over older ones
+    by_match = {}
+    for suffix in reversed(RAW_JSON_SUFFIXES):
+        by_match.update({f.name[:-len("_stats" + suffix)]: f
+                         for f in season_raw.glob("*_stats" + suffix)})
+    stats_files = [by_match[m] for m in sorted(by_match)]
     if not stats_files:
         return {"skipped": True, "reason": "no stats files"}
 
@@ -65,9 +70,8 @@ def reprocess_season(scraper: OptaScraper, league: str, season: str,
 
     for stats_file in stats_files:
         try:
-            with open(stats_file, encoding="utf-8") as f:
-                match_data = json.load(f)
-        except (json.JSONDecodeError, OSError) as e:
+            match_data = read_raw_json(stats_file)
+        except (ValueError, OSError, EOFError, zlib.error) as e:
             warnings.append(f"  Failed to read {stats_file.name}: {e}")
             continue
 
@@ -79,8 +83,8 @@ def reprocess_season(scraper: OptaScraper, league: str, season: str,
         lineups = scraper.extract_lineups(match_data)
         events = scraper.extract_match_events(match_data)
 
-        all_lineups.extend([asdict(l) for l in lineups])
-        all_events.extend([asdict(e) for e in events])
+        all_lineups.extend(as_rows(lineups))
+        all_events.extend(as_rows(events))
         match_count += 1
 
         # Validate
@@ -30,11 +30,15 @@ import argparse
 import logging
 import shutil
 import sys
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timedelta
-from opta_scraper import OptaScraper, MatchEvent, ShotEvent, PlayerLineup, AllMatchEvent
-from dataclasses import asdict
+from build_manifest import write_manifest
+from consolidate_opta import dedup_keep_last
+from opta_scraper import (OptaScraper, MatchEvent, ShotEvent, PlayerLineup, AllMatchEvent,
+                          SHOT_SCHEMA, as_rows)
 import pandas as pd
+import pyarrow.compute
 import pyarrow.lib
 import pyarrow.parquet
 import requests
@@ -42,6 +46,32 @@ import requests
 logger = logging.getLogger(__name__)
 
 
+def _manifest_key_sets(manifest_path: Path) -> tuple:
+    """Read (complete, unavailable) sets of (match_id, competition, season).
+
+    Projects just the key and flag columns and filters in Arrow, so the
+    has_* columns the scraper doesn't need here are never decoded.
+    """
+    names = pyarrow.parquet.read_schema(manifest_path).names
+    if 'has_match_events' not in names:
+        raise KeyError('has_match_events')
+    flag_cols = [c for c in ('has_match_events', 'event_unavailable') if c in names]
+    table = pyarrow.parquet.read_table(
+        manifest_path, columns=['match_id', 'competition', 'season'] + flag_cols,
+        memory_map=True,
+    )
+
+    def _keys(flag_col):
+        if flag_col not in table.column_names:
+            return set()
+        flagged = table.filter(pyarrow.compute.equal(table.column(flag_col), True))
+        return set(zip(flagged.column('match_id').to_pylist(),
+                       flagged.column('competition').to_pylist(),
+                       flagged.column('season').to_pylist()))
+
+    return _keys('has_match_events'), _keys('event_unavailable')
+
+
 def load_manifest(manifest_path: Path, include_unavailable: bool = True) -> tuple:
     """Load existing match IDs from manifest file.
 
@@ -57,34 +87,21 @@ def load_manifest(manifest_path: Path, include_unavailable: bool = True) -> tupl
         return set(), set()
 
     try:
-        df = pd.read_parquet(manifest_path)
-
-        # Matches with complete event data
-        complete = df[df['has_match_events'] == True]
-        complete_set = set(zip(complete['match_id'], complete['competition'], complete['season']))
-
-        # Matches where event data was unavailable (404)
-        unavailable_set = set()
-        if 'event_unavailable' in df.columns:
-            unavailable = df[df['event_unavailable'] == True]
-            unavailable_set = set(zip(unavailable['match_id'], unavailable['competition'], unavailable['season']))
+        # Matches with complete event data, and matches where event data
+        # was unavailable (404)
+        complete_set, unavailable_set = _manifest_key_sets(manifest_path)
 
         print(f"Loaded manifest: {len(complete_set):,} complete, {len(unavailable_set):,} unavailable")
         return complete_set, unavailable_set
     except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
-            pyarrow.lib.ArrowInvalid) as e:
+            pyarrow.lib.ArrowInvalid, KeyError) as e:
         print(f"Warning: Error loading manifest: {e}. Trying backup...")
         backup_path = manifest_path.with_suffix('.parquet.backup')
         if backup_path.exists():
             try:
-                df = pd.read_parquet(backup_path)
-                print(f"Recovered manifest from backup ({len(df):,} records)")
-                complete = df[df['has_match_events'] == True]
-                complete_set = set(zip(complete['match_id'], complete['competition'], complete['season']))
-                unavailable_set = set()
-                if 'event_unavailable' in df.columns:
-                    unavailable = df[df['event_unavailable'] == True]
-                    unavailable_set = set(zip(unavailable['match_id'], unavailable['competition'], unavailable['season']))
+                complete_set, unavailable_set = _manifest_key_sets(backup_path)
+                print(f"Recovered manifest from backup "
+                      f"({pyarrow.parquet.read_metadata(backup_path).num_rows:,} records)")
                 return complete_set, unavailable_set
             except (pd.errors.ParserError, FileNotFoundError, OSError, ValueError,
                     pyarrow.lib.ArrowInvalid, KeyError) as backup_err:
@@ -271,7 +288,7 @@ def update_manifest(manifest_path: Path, new_matches: list) -> bool:
         combined = new_df
 
     try:
-        combined.to_parquet(manifest_path, index=False, compression='gzip')
+        write_manifest(combined, manifest_path)
     except (OSError, pyarrow.lib.ArrowInvalid) as e:
         logger.error("Failed to write manifest: %s", e)
         return False
@@ -369,7 +386,9 @@ def heal_unavailable_events(scraper, opta_dir: Path, manifest_path: Path,
     if cap <= 0 or not manifest_path.exists():
         return summary
     try:
-        man = pd.read_parquet(manifest_path)
+        # Only this season's rows are candidates — push the filter into the
+        # row-group scan rather than loading the full ~100k-row manifest
+        man = pd.read_parquet(manifest_path, filters=[("season", "=", season)])
     except (pd.errors.ParserError, OSError, ValueError, pyarrow.lib.ArrowInvalid) as e:
         logger.error("Heal: could not read manifest (%s) — skipping heal pass", e)
         return summary
@@ -417,8 +436,8 @@ def heal_unavailable_events(scraper, opta_dir: Path, manifest_path: Path,
                 logger.warning("Heal: parse failed for %s: %s", mid, e)
                 summary["errors"] += 1
                 continue
-            me_rows.extend([asdict(e) for e in me])
-            se_rows.extend([asdict(s) for s in se])
+            me_rows.extend(as_rows(me))
+            se_rows.extend(as_rows(se))
             rec = existing_rows[mid]
             rec.update({"has_match_events": True, "has_stats_events": True,
                         "event_unavailable": False})
@@ -718,6 +737,37 @@ def get_season_date_range(season_name: str) -> tuple:
     return date_ranges
 
 
+# Match events run ~2000 rows per match. Accumulated rows are moved into an
+# Arrow table every this many, since a season held as row dicts costs ~6x the
+# memory of the same rows in columns (~650 MB vs ~110 MB for 380 matches).
+MATCH_EVENT_BATCH_ROWS = 100_000
+
+
+def _rows_to_table(rows: list):
+    """Convert accumulated row dicts to an Arrow table, or None on failure.
+
+    Falls back to pandas' object-column coercion for rows Arrow can't type
+    on its own, as combine_and_save does for the other tables.
+    """
+    try:
+        return pyarrow.Table.from_pylist(rows)
+    except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError):
+        try:
+            return pyarrow.Table.from_pandas(pd.DataFrame(rows), preserve_index=False)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError) as e:
+            logger.error("Failed to convert %d match event rows: %s", len(rows), e)
+            return None
+
+
+def _match_ids(new_data: list) -> set:
+    """match_ids in a combine_and_save() input: row dicts, DataFrames or Arrow tables."""
+    if isinstance(new_data[0], pyarrow.Table):
+        return {m for t in new_data for m in t.column("match_id").to_pylist()}
+    if isinstance(new_data[0], pd.DataFrame):
+        return {m for df in new_data for m in df["match_id"]}
+    return {r["match_id"] for r in new_data}
+
+
 def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
                   season_id: str, complete_matches: set, unavailable_matches: set,
                   force_rescrape: bool = False, retry_unavailable: bool = False,
@@ -768,17 +818,15 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
     skipped_unavailable = 0
     if not force_rescrape:
         # Get match_ids with complete data from manifest
-        for match_id, comp, season in complete_matches:
-            if comp == competition and season == season_name:
-                existing_match_ids.add(match_id)
+        existing_match_ids = {match_id for match_id, comp, season in complete_matches
+                              if comp == competition and season == season_name}
 
         # Also skip matches where event data was unavailable (404), unless retrying
         if not retry_unavailable:
-            for match_id, comp, season in unavailable_matches:
-                if comp == competition and season == season_name:
-                    if match_id not in existing_match_ids:
-                        existing_match_ids.add(match_id)
-                        skipped_unavailable += 1
+            unavailable_ids = {match_id for match_id, comp, season in unavailable_matches
+                               if comp == competition and season == season_name}
+            skipped_unavailable = len(unavailable_ids - existing_match_ids)
+            existing_match_ids |= unavailable_ids
 
         if existing_match_ids:
             msg = f"Manifest shows {len(existing_match_ids)} matches to skip"
@@ -794,12 +842,26 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
     all_shots = []
     all_shot_events = []
     all_match_events = []  # ALL events with x/y coords (~2000/match)
+    match_event_tables = []  # all_match_events batches, moved into Arrow
     all_events = []
     all_lineups = []
     new_matches_scraped = 0
     new_manifest_records = []  # Track new matches for manifest update
 
     all_fixture_records = []
+    # Matches whose new rows for some table were not saved (a failed batch
+    # conversion or parquet write); kept out of the manifest so the next run
+    # scrapes them again
+    failed_matches = set()
+
+    def flush_match_events():
+        nonlocal all_match_events
+        table = _rows_to_table(all_match_events)
+        if table is None:
+            failed_matches.update(r["match_id"] for r in all_match_events)
+        else:
+            match_event_tables.append(table)
+        all_match_events = []
 
     for start_date, end_date in date_ranges:
         if start_date > today_iso:
@@ -858,15 +920,17 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
         if fixtures_only:
             continue
 
-        for i, match in enumerate(new_matches):
-            match_id = match["matchInfo"]["id"]
+        # Matches are fetched on the scraper's worker threads (raw JSON is
+        # written there too, and fresh raw JSON from a crashed earlier run is
+        # reused) and handed back in order for extraction
+        fetched = scraper.fetch_matches([m["matchInfo"]["id"] for m in new_matches], raw_dir,
+                                        force_refresh=force_rescrape)
+        for i, (match, (match_id, stats, event_data)) in enumerate(zip(new_matches, fetched)):
             match_desc = match["matchInfo"]["description"]
             match_date = match["matchInfo"]["date"]
 
             print(f"  [{i+1}/{len(new_matches)}] {match_date[:10]} {match_desc}...", end=" ", flush=True)
 
-            # Get matchstats data
-            stats = scraper.get_match_stats(match_id)
             if not stats:
                 logger.warning("No stats data for match %s (%s). Skipping.", match_id, match_desc)
                 continue
@@ -878,27 +942,26 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
             has_events = False  # Will be set to True if we get event data
 
             # Extract from matchstats
-            player_df = scraper.extract_all_player_stats(stats)
-            all_player_stats.append(player_df)
-
-            shots = scraper.extract_player_shots(stats)
-            all_shots.extend([asdict(s) for s in shots])
+            player_rows, shots = scraper.extract_player_stats_and_shots(stats)
+            all_player_stats.extend(player_rows)
+            all_shots.extend(shots)
 
             events = scraper.extract_match_events(stats)
-            all_events.extend([asdict(e) for e in events])
+            all_events.extend(as_rows(events))
 
-            lineups = scraper.extract_lineups(stats)
-            all_lineups.extend([asdict(l) for l in lineups])
+            lineups = scraper.extract_lineups(stats, player_rows)
+            all_lineups.extend(as_rows(lineups))
 
-            # Get matchevent data (event-level with x/y coords)
-            event_data = scraper.get_match_events(match_id)
+            # matchevent data (event-level with x/y coords)
             if event_data:
                 shot_events = scraper.extract_shot_events(event_data)
-                all_shot_events.extend([asdict(s) for s in shot_events])
+                all_shot_events.extend(as_rows(shot_events))
 
                 # Extract ALL events with x/y coords (passes, tackles, aerials, etc.)
                 match_events = scraper.extract_all_match_events(event_data)
-                all_match_events.extend([asdict(e) for e in match_events])
+                all_match_events.extend(as_rows(match_events))
+                if len(all_match_events) >= MATCH_EVENT_BATCH_ROWS:
+                    flush_match_events()
                 has_events = True
 
             # Add manifest record for this match
@@ -930,40 +993,46 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
                 'event_unavailable': not has_match_events_complete and not is_recent,
             })
 
-            # Save raw JSON files
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            try:
-                with open(raw_dir / f"{match_id}_stats.json", "w") as f:
-                    json.dump(stats, f)
-                if event_data:
-                    with open(raw_dir / f"{match_id}_events.json", "w") as f:
-                        json.dump(event_data, f)
-            except OSError as e:
-                logger.warning("Failed to write raw JSON for match %s: %s. Continuing.", match_id, e)
-
             print("OK")
 
-    # Helper to combine new data with existing parquet
-    def combine_and_save(new_data, output_path, dedup_cols):
+    # Helper to combine new data with existing parquet. Returns the row count
+    # of the saved file, or None when it could not be read or written; the
+    # matches in new_data are then added to failed_matches.
+    def combine_and_save(new_data, output_path, dedup_cols, schema=None):
         if not new_data:
             if output_path.exists():
                 try:
-                    return pd.read_parquet(output_path)
-                except (pd.errors.ParserError, OSError, ValueError, pyarrow.lib.ArrowInvalid) as e:
+                    # Footer only — no need to decode the file just to count it
+                    return pyarrow.parquet.read_metadata(output_path).num_rows
+                except (OSError, pyarrow.lib.ArrowInvalid) as e:
                     logger.error("Failed to read existing %s: %s", output_path, e)
-                    return pd.DataFrame()
-            return pd.DataFrame()
+                    return None
+            return 0
 
-        if isinstance(new_data[0], pd.DataFrame):
-            new_df = pd.concat(new_data, ignore_index=True)
-        else:
-            new_df = pd.DataFrame(new_data)
+        def failed():
+            failed_matches.update(_match_ids(new_data))
+            return None
+
+        try:
+            if schema is not None:
+                # Fixed-schema rows go straight to Arrow, skipping pandas'
+                # per-column dtype inference
+                new_table = pyarrow.Table.from_pylist(new_data, schema=schema)
+            elif isinstance(new_data[0], pyarrow.Table):
+                new_table = pyarrow.concat_tables(new_data, promote_options='permissive')
+            elif isinstance(new_data[0], pd.DataFrame):
+                new_table = pyarrow.Table.from_pandas(
+                    pd.concat(new_data, ignore_index=True), preserve_index=False)
+            else:
+                new_table = pyarrow.Table.from_pandas(
+                    pd.DataFrame(new_data), preserve_index=False)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError) as e:
+            logger.error("Failed to convert new %s records: %s", output_path.parent.name, e)
+            return failed()
 
         if output_path.exists():
             try:
-                existing_df = pd.read_parquet(output_path)
-                combined = pd.concat([existing_df, new_df], ignore_index=True)
-                combined = combined.drop_duplicates(subset=dedup_cols, keep='last')
+                existing = pyarrow.parquet.read_table(output_path)
             except (pd.errors.ParserError, OSError, ValueError, pyarrow.lib.ArrowInvalid) as e:
                 logger.error("Failed to read existing %s: %s. Writing new records only.", output_path, e)
                 try:
@@ -972,18 +1041,41 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
                     logger.error("Moved corrupt file to %s", corrupt_path)
                 except OSError as rename_err:
                     logger.warning("Could not move corrupt file %s aside: %s", output_path, rename_err)
-                logger.warning("Writing %d new records only — historical data from %s is lost", len(new_df), output_path)
-                combined = new_df
+                logger.warning("Writing %d new records only — historical data from %s is lost", new_table.num_rows, output_path)
+                combined = new_table
+            else:
+                # Arrow concat references both tables' chunks instead of
+                # copying them; permissive promotion covers int -> float and
+                # all-null columns. Types that can't be unified (e.g. str vs
+                # int across scrapes) fall back to pandas' object coercion.
+                try:
+                    # Drop the pandas metadata: it describes only the first
+                    # table's columns and dtypes, not the promoted schema
+                    combined = pyarrow.concat_tables(
+                        [existing, new_table], promote_options='permissive'
+                    ).replace_schema_metadata(None)
+                except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError):
+                    try:
+                        combined = pyarrow.Table.from_pandas(
+                            pd.concat([existing.to_pandas(), new_table.to_pandas()], ignore_index=True),
+                            preserve_index=False,
+                        )
+                    except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError) as e:
+                        logger.error("Failed to combine %s with new records: %s", output_path, e)
+                        return failed()
+                del existing
+                combined = dedup_keep_last(combined, dedup_cols)
         else:
-            combined = new_df
+            combined = new_table
 
-        if not combined.empty:
+        if combined.num_rows:
             try:
-                combined.to_parquet(output_path, index=False)
+                pyarrow.parquet.write_table(combined, output_path,
+                                            compression='zstd', compression_level=3)
             except (OSError, pyarrow.lib.ArrowInvalid) as e:
                 logger.error("Failed to write %s: %s", output_path, e)
-                return pd.DataFrame()
-        return combined
+                return failed()
+        return combined.num_rows
 
     # Combine and save all data types
     results = {}
@@ -996,15 +1088,18 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
         results["shots"] = combine_and_save(
             all_shots,
             output_dirs["shots"] / f"{season_name}.parquet",
-            ["match_id", "player_id"]
+            ["match_id", "player_id"],
+            schema=SHOT_SCHEMA,
         )
         results["shot_events"] = combine_and_save(
             all_shot_events,
             output_dirs["shot_events"] / f"{season_name}.parquet",
             ["match_id", "event_id"]
         )
+        if all_match_events:
+            flush_match_events()
         results["match_events"] = combine_and_save(
-            all_match_events,
+            match_event_tables,
             output_dirs["match_events"] / f"{season_name}.parquet",
             ["match_id", "event_id"]
         )
@@ -1025,34 +1120,41 @@ def scrape_season(scraper: OptaScraper, competition: str, season_name: str,
         fixture_df = fixture_df.drop_duplicates(subset=["match_id"])
         fixture_path = output_dirs["fixtures"] / f"{season_name}.parquet"
         try:
-            fixture_df.to_parquet(fixture_path, index=False)
-            results["fixtures"] = fixture_df
+            fixture_df.to_parquet(fixture_path, index=False, compression='zstd',
+                                  compression_level=3)
+            results["fixtures"] = len(fixture_df)
             print(f"\n  Fixtures: {len(fixture_df)} matches ({fixture_df['match_status'].value_counts().to_dict()})")
         except (OSError, pyarrow.lib.ArrowInvalid) as e:
             logger.error("Failed to write fixtures %s: %s", fixture_path, e)
-            results["fixtures"] = pd.DataFrame()
+            results["fixtures"] = 0
     else:
-        results["fixtures"] = pd.DataFrame()
+        results["fixtures"] = 0
+
+    if failed_matches:
+        logger.error("%d matches have unsaved rows; leaving them out of the "
+                     "manifest so they are re-scraped", len(failed_matches))
+        new_manifest_records = [r for r in new_manifest_records
+                                if r['match_id'] not in failed_matches]
 
     # Summary
     print(f"\n{competition} {season_name} Complete:")
     print(f"  New matches scraped: {new_matches_scraped}")
     print(f"  Total matches: {len(existing_match_ids)}")
-    for name, df in results.items():
-        if not df.empty:
-            print(f"  {name}: {len(df)} records")
+    for name, n_rows in results.items():
+        if n_rows:
+            print(f"  {name}: {n_rows} records")
 
     return {
         "competition": competition,
         "season": season_name,
         "new_matches": new_matches_scraped,
         "total_matches": len(existing_match_ids),
-        "player_records": len(results.get("player_stats", pd.DataFrame())),
-        "shot_records": len(results.get("shots", pd.DataFrame())),
-        "shot_event_records": len(results.get("shot_events", pd.DataFrame())),
-        "match_event_records": len(results.get("match_events", pd.DataFrame())),
-        "event_records": len(results.get("events", pd.DataFrame())),
-        "lineup_records": len(results.get("lineups", pd.DataFrame())),
+        "player_records": results.get("player_stats") or 0,
+        "shot_records": results.get("shots") or 0,
+        "shot_event_records": results.get("shot_events") or 0,
+        "match_event_records": results.get("match_events") or 0,
+        "event_records": results.get("events") or 0,
+        "lineup_records": results.get("lineups") or 0,
         "manifest_records": new_manifest_records,
     }
 
@@ -1103,6 +1205,11 @@ def main():
     parser.add_argument("--heal-dry-run", action="store_true",
                        help="List what the self-heal pass would re-fetch (per comp) "
                             "without making API calls.")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Concurrent match fetches. Requests are still paced "
+                            "by the scraper's rate limiter, which admits this many "
+                            "per 1-2s window, so N > 1 raises the request rate "
+                            "N-fold (default: 1 = fully serial).")
     parser.add_argument("--dry-run", action="store_true",
                        help="Build the scrape plan, load + reconcile the manifest "
                             "(read-only), print what WOULD be scraped, then exit "
@@ -1182,7 +1289,7 @@ def main():
 
     # Initialize scraper
     script_dir = Path(__file__).parent
-    scraper = OptaScraper(data_dir=str(script_dir / "data"))
+    scraper = OptaScraper(data_dir=str(script_dir / "data"), max_workers=args.workers)
 
     # Load manifest (tracks which matches have been scraped)
     pannadata_dir = get_pannadata_dir()
@@ -1242,11 +1349,10 @@ def main():
         print("=" * 60)
         print("DRY RUN — exiting before API calls / writes")
         print("=" * 60)
+        # One pass over the manifest instead of one full scan per plan entry
+        complete_counts = Counter((comp, seas) for (_mid, comp, seas) in complete_matches)
         for league, season_name, _ in scrape_plan:
-            n_complete = sum(
-                1 for (_mid, comp, seas) in complete_matches
-                if comp == league and seas == season_name
-            )
+            n_complete = complete_counts[(league, season_name)]
             print(f"  - {league} {season_name}: {n_complete} already complete in manifest; "
                   f"would scrape NEW played matches in the window")
         print(f"Reconcile would invalidate (re-scrape): {n_invalidated} matches")
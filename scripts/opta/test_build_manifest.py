@@ -0,0 +1,60 @@
+"""Tests for build_manifest() in build_manifest.py.
+
+The manifest is built column-wise by outer-joining one key frame per table
+type; these pin that a match missing from some tables still gets a single row
+with the right has_* flags, since the scraper skips anything the manifest
+marks complete.
+"""
+import os
+
+import pandas as pd
+
+from build_manifest import build_manifest
+
+
+def _write_ids(opta_dir, table_type, competition, season, match_ids):
+    league_dir = opta_dir / table_type / competition
+    league_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"match_id": match_ids}).to_parquet(
+        league_dir / f"{season}.parquet", index=False
+    )
+
+
+def test_outer_join_flags_and_sorted_rows(opta_dir, tmp_path):
+    _write_ids(opta_dir, "player_stats", "EPL", "2024-2025", ["m2", "m1", "m1"])
+    _write_ids(opta_dir, "match_events", "EPL", "2024-2025", ["m1"])
+    _write_ids(opta_dir, "lineups", "La_Liga", "2024-2025", ["m3"])
+
+    manifest = build_manifest(str(opta_dir), str(tmp_path / "manifest.parquet"))
+
+    assert list(manifest.columns) == [
+        "match_id", "competition", "season", "has_player_stats", "has_shots",
+        "has_match_events", "has_lineups", "event_unavailable",
+    ]
+    assert manifest["match_id"].tolist() == ["m1", "m2", "m3"]
+    assert manifest["has_player_stats"].tolist() == [True, True, False]
+    assert manifest["has_shots"].tolist() == [False, False, False]
+    assert manifest["has_match_events"].tolist() == [True, False, False]
+    assert manifest["has_lineups"].tolist() == [False, False, True]
+    assert manifest["event_unavailable"].tolist() == [False, True, True]
+    assert manifest["has_lineups"].dtype == bool
+
+
+def test_incremental_rereads_only_changed_files(opta_dir, tmp_path, capsys):
+    out = tmp_path / "manifest.parquet"
+    _write_ids(opta_dir, "player_stats", "EPL", "2024-2025", ["m1"])
+    _write_ids(opta_dir, "match_events", "EPL", "2024-2025", ["m1"])
+    build_manifest(str(opta_dir), str(out))
+
+    # Make the EPL files look older than the manifest, then add a new season.
+    old = out.stat().st_mtime - 60
+    for f in opta_dir.glob("*/EPL/2024-2025.parquet"):
+        os.utime(f, (old, old))
+    _write_ids(opta_dir, "player_stats", "EPL", "2025-2026", ["m9"])
+
+    full = build_manifest(str(opta_dir), str(tmp_path / "full.parquet"))
+    capsys.readouterr()
+    incremental = build_manifest(str(opta_dir), str(out), incremental=True)
+
+    assert "2 unchanged files reused" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(incremental, full)
@@ -0,0 +1,109 @@
+"""Tests for the Arrow merge helpers in consolidate_opta.py.
+
+The consolidator dedups league tables in Arrow rather than pandas; these pin
+that the Arrow path keeps pandas' drop_duplicates(keep='last') semantics, since
+a silent change there would drop re-scraped rows in favour of stale ones, and
+that the output stays partitioned by league at the row-group level.
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from consolidate_opta import (_key_column, consolidate_events_by_league,
+                              consolidate_opta, dedup_keep_last)
+
+
+def test_dedup_keeps_last_occurrence_in_original_order():
+    table = pa.table({
+        "match_id": ["m1", "m2", "m1", "m3", "m2"],
+        "player_id": ["p1", "p1", "p1", "p1", "p1"],
+        "value": [1, 2, 3, 4, 5],
+    })
+
+    result = dedup_keep_last(table, ["match_id", "player_id"])
+
+    assert result.column("match_id").to_pylist() == ["m1", "m3", "m2"]
+    assert result.column("value").to_pylist() == [3, 4, 5]
+
+
+def test_dedup_matches_pandas_with_null_keys():
+    """Null keys group together, exactly as pandas treats NaN/None keys."""
+    df = pd.DataFrame({
+        "match_id": ["m1", "m1", "m1", "m2", "m2"],
+        "player_id": [None, None, "p1", None, "p1"],
+        "value": [1, 2, 3, 4, 5],
+    })
+    expected = df.drop_duplicates(subset=["match_id", "player_id"], keep="last")
+
+    result = dedup_keep_last(pa.Table.from_pandas(df, preserve_index=False),
+                              ["match_id", "player_id"])
+
+    assert result.column("value").to_pylist() == expected["value"].tolist()
+
+
+def test_key_column_nulls_match_each_other_but_not_empty_string():
+    table = pa.table({
+        "match_id": ["m1", "m1", "m1"],
+        "player_id": [None, "", None],
+    })
+
+    keys = _key_column(table, ["match_id", "player_id"]).to_pylist()
+
+    assert keys[0] == keys[2]
+    assert keys[0] != keys[1]
+
+
+def _write_season(opta_dir, competition, season, match_ids):
+    league_dir = opta_dir / "player_stats" / competition
+    league_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "match_id": match_ids,
+        "player_id": ["p1"] * len(match_ids),
+        "goals": list(range(len(match_ids))),
+    }).to_parquet(league_dir / f"{season}.parquet", index=False)
+
+
+def test_row_groups_never_span_leagues(opta_dir, monkeypatch):
+    """Readers prune by competition via row-group statistics, and the next
+    consolidation indexes the existing file the same way."""
+    monkeypatch.setenv("OPTA_CONSOLIDATE_FORCE", "1")
+    _write_season(opta_dir, "EPL", "2024-2025", ["m2", "m1"])
+    _write_season(opta_dir, "La_Liga", "2024-2025", ["m3"])
+    consolidate_opta(str(opta_dir), str(opta_dir))
+    # Re-scrape one EPL season: existing rows are streamed, m1 is replaced
+    _write_season(opta_dir, "EPL", "2024-2025", ["m1"])
+    _write_season(opta_dir, "EPL", "2025-2026", ["m4"])
+    assert consolidate_opta(str(opta_dir), str(opta_dir)) == 0
+    # A league the indexed file has no row groups for yet
+    _write_season(opta_dir, "Serie_A", "2024-2025", ["m5"])
+    assert consolidate_opta(str(opta_dir), str(opta_dir)) == 0
+
+    path = opta_dir / "opta_player_stats.parquet"
+    metadata = pq.ParquetFile(path).metadata
+    comp_idx = metadata.schema.names.index("competition")
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(comp_idx).statistics
+        assert stats.has_min_max and stats.min == stats.max
+
+    epl = pq.read_table(path, filters=[("competition", "=", "EPL")])
+    assert sorted(epl.column("match_id").to_pylist()) == ["m1", "m2", "m4"]
+    serie_a = pq.read_table(path, filters=[("competition", "=", "Serie_A")])
+    assert serie_a.column("match_id").to_pylist() == ["m5"]
+
+
+def test_new_events_without_event_id_are_not_collapsed(opta_dir, monkeypatch):
+    """event_id comes into the unified schema from the existing file alone;
+    new rows without one have no key to dedup on and must all survive."""
+    monkeypatch.setenv("OPTA_CONSOLIDATE_FORCE", "1")
+    league_dir = opta_dir / "match_events" / "EPL"
+    league_dir.mkdir(parents=True)
+    pd.DataFrame({"match_id": ["m1", "m1", "m1"], "event_id": [1, 2, 2],
+                  "x": [1.0, 2.0, 3.0]}).to_parquet(league_dir / "2023-2024.parquet", index=False)
+    consolidate_events_by_league(str(opta_dir), str(opta_dir))
+    pd.DataFrame({"match_id": ["m2", "m2", "m2"],
+                  "x": [4.0, 5.0, 6.0]}).to_parquet(league_dir / "2024-2025.parquet", index=False)
+    consolidate_events_by_league(str(opta_dir), str(opta_dir))
+
+    events = pq.read_table(opta_dir / "events_consolidated" / "events_EPL.parquet").to_pandas()
+
+    assert events["x"].tolist() == [1.0, 3.0, 4.0, 5.0, 6.0]
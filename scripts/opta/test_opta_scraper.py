@@ -0,0 +1,226 @@
+"""Tests for OptaScraper's concurrent match fetching and rate limiter.
+
+Match fetches run on worker threads; these pin that callers still see matches
+in input order and that the shared limiter admits max_workers requests per
+delay window, never more.
+"""
+import gzip
+import json
+import os
+import time
+
+import opta_scraper
+from opta_scraper import OptaScraper
+
+
+def _fake_api(monkeypatch, scraper, stats, events):
+    """Serve matchstats/matchevent from stats(mid) / events(mid) callables,
+    as the API would: parsed payload plus the raw response bytes."""
+    def fetch_body(endpoint, params, max_retries=3):
+        feed, _, match_id = endpoint.split("/")
+        data = (stats if feed == "matchstats" else events)(match_id)
+        if data is None:
+            return None, 404, None
+        return data, 200, json.dumps(data).encode()
+
+    monkeypatch.setattr(scraper, "_fetch_body", fetch_body)
+
+
+def test_rate_limit_admits_max_workers_per_window(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path), max_workers=2)
+    sleeps = []
+    monkeypatch.setattr(opta_scraper.time, "monotonic", lambda: 100.0)
+    monkeypatch.setattr(opta_scraper.time, "sleep", sleeps.append)
+
+    for _ in range(5):
+        scraper._rate_limit(min_delay=1.0, max_delay=1.0)
+
+    # Two free slots, then each request waits for the oldest of the last two
+    assert sleeps == [1.0, 1.0, 2.0]
+
+
+def test_429_retry_after_pauses_the_shared_limiter(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path), max_workers=2)
+    sleeps = []
+    monkeypatch.setattr(opta_scraper.time, "monotonic", lambda: 100.0)
+    monkeypatch.setattr(opta_scraper.time, "sleep", sleeps.append)
+
+    class Resp:
+        def __init__(self, status, headers=None):
+            self.status_code, self.headers = status, headers or {}
+            self.content = b'{"ok": true}'
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return json.loads(self.content)
+
+    responses = iter([Resp(429, {"Retry-After": "7"}), Resp(200)])
+    monkeypatch.setattr(scraper.session, "get", lambda *a, **k: next(responses))
+
+    assert scraper._fetch("matchstats/x/m1", {}) == {"ok": True}
+    assert sleeps == [7.0]
+    # Another worker's next request waits out the same pause
+    scraper._request_times.clear()
+    scraper._rate_limit(min_delay=0.0, max_delay=0.0)
+    assert sleeps == [7.0, 7.0]
+
+
+def test_fetch_matches_yields_in_input_order(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path), max_workers=4)
+    event_calls = []
+
+    def fake_events(mid):
+        event_calls.append(mid)
+        return {"events": mid}
+
+    _fake_api(monkeypatch, scraper,
+              lambda mid: None if mid == "m2" else {"id": mid}, fake_events)
+
+    raw_dir = tmp_path / "raw"
+    results = list(scraper.fetch_matches(["m1", "m2", "m3"], raw_dir))
+
+    assert [r[0] for r in results] == ["m1", "m2", "m3"]
+    assert results[1] == ("m2", None, None)
+    assert results[2] == ("m3", {"id": "m3"}, {"events": "m3"})
+    # No event request for a match whose stats failed
+    assert sorted(event_calls) == ["m1", "m3"]
+    assert sorted(p.name for p in raw_dir.iterdir()) == [
+        "m1_events.json.zst", "m1_stats.json.zst", "m3_events.json.zst", "m3_stats.json.zst",
+    ]
+
+
+def test_fetch_matches_bounds_fetches_ahead_of_caller(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path), max_workers=2)
+    calls = []
+    _fake_api(monkeypatch, scraper,
+              lambda mid: calls.append(mid) or {"id": mid}, lambda mid: {})
+    ids = [f"m{i}" for i in range(10)]
+
+    results = scraper.fetch_matches(ids)
+    first = next(results)
+    # Only the first window of 2 * max_workers matches has been submitted
+    assert len(calls) <= 4
+    assert [first[0]] + [r[0] for r in results] == ids
+    assert sorted(calls) == sorted(ids)
+
+
+def test_fetch_matches_reuses_fresh_raw_json(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path))
+    calls = []
+    _fake_api(monkeypatch, scraper,
+              lambda mid: calls.append(mid) or {"id": mid},
+              lambda mid: {"events": mid} if mid == "m1" else None)
+    raw_dir = tmp_path / "raw"
+
+    list(scraper.fetch_matches(["m1", "m2"], raw_dir))
+    assert not list(raw_dir.glob("*.tmp"))
+    calls.clear()
+
+    cached = list(scraper.fetch_matches(["m1", "m2"], raw_dir))
+    # m1 is fully cached; m2 had no event feed, so it is asked for again
+    assert calls == ["m2"]
+    assert cached[0] == ("m1", {"id": "m1"}, {"events": "m1"})
+
+    calls.clear()
+    list(scraper.fetch_matches(["m1"], raw_dir, force_refresh=True))
+    assert calls == ["m1"]
+
+
+def test_settled_matches_are_reused_past_the_cache_max_age(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path))
+    calls = []
+
+    def stats(mid):
+        calls.append(mid)
+        status = "Played" if mid == "old" else "Fixture"
+        return {"matchInfo": {"date": "2024-09-01Z"},
+                "liveData": {"matchDetails": {"matchStatus": status}}}
+
+    _fake_api(monkeypatch, scraper, stats, lambda mid: {"events": mid})
+    raw_dir = tmp_path / "raw"
+    list(scraper.fetch_matches(["old", "unplayed"], raw_dir))
+    # Both fetched well after match day, but longer ago than the max age
+    stale = time.time() - 2 * scraper.RAW_CACHE_MAX_AGE.total_seconds()
+    for path in raw_dir.iterdir():
+        os.utime(path, (stale, stale))
+    calls.clear()
+
+    list(scraper.fetch_matches(["old", "unplayed"], raw_dir))
+
+    assert calls == ["unplayed"]
+
+
+def test_discovered_seasons_are_cached_for_later_instances(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path))
+    monkeypatch.setattr(scraper, "discover_seasons",
+                        lambda comp: {"2030-2031": "new-id"})
+    monkeypatch.setattr(scraper, "get_season_matches", lambda *a: [])
+
+    scraper.scrape_season_full("EPL", "2030-2031", "2030-08-01", "2031-06-01")
+
+    fresh = OptaScraper(data_dir=str(tmp_path))
+    assert fresh.SEASONS["EPL_2030-2031"] == "new-id"
+    # Hard-coded IDs are still there, and the class table is untouched
+    assert fresh.SEASONS["EPL_2024-2025"] == OptaScraper.SEASONS["EPL_2024-2025"]
+    assert "EPL_2030-2031" not in OptaScraper.SEASONS
+
+
+def test_cache_reads_raw_json_from_older_runs(tmp_path, monkeypatch):
+    scraper = OptaScraper(data_dir=str(tmp_path))
+    _fake_api(monkeypatch, scraper, lambda mid: 1 / 0, lambda mid: 1 / 0)
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    (raw_dir / "m1_stats.json").write_text('{"id": "m1"}')
+    (raw_dir / "m1_events.json.gz").write_bytes(gzip.compress(b'{"events": "m1"}'))
+
+    assert list(scraper.fetch_matches(["m1"], raw_dir)) == [
+        ("m1", {"id": "m1"}, {"events": "m1"}),
+    ]
+
+
+def test_lineups_from_player_rows_match_a_fresh_stat_walk(tmp_path):
+    scraper = OptaScraper(data_dir=str(tmp_path))
+    player = lambda pid, place, stats: {
+        "playerId": pid, "formationPlace": place, "position": "Midfielder",
+        "stat": [{"type": t, "value": v} for t, v in stats],
+    }
+    match = {
+        "matchInfo": {"id": "m1", "contestant": [{"id": "t1", "name": "Home"}]},
+        "liveData": {
+            "lineUp": [{"contestantId": "t1", "player": [
+                player("p1", "1", [("minsPlayed", "64"), ("touches", "40")]),
+                player("p2", "0", [("gameStarted", "0"), ("passes", "12")]),
+                player("p3", "", []),
+            ]}],
+            "substitute": [{"timeMinSec": "64:10", "playerOnId": "p2", "playerOffId": "p1"}],
+        },
+    }
+
+    rows = scraper.extract_player_stats_rows(match)
+
+    assert scraper.extract_lineups(match, rows) == scraper.extract_lineups(match)
+
+
+def test_shots_only_path_matches_rows_derived_from_player_stats(tmp_path):
+    scraper = OptaScraper(data_dir=str(tmp_path))
+    stat = lambda t, v: {"type": t, "value": v}
+    match = {
+        "matchInfo": {"id": "m1", "contestant": [{"id": "t1", "name": "Home"}]},
+        "liveData": {"lineUp": [{"contestantId": "t1", "player": [
+            {"playerId": "p1", "matchName": "A", "position": "Striker", "stat": [
+                stat("totalScoringAtt", "4"), stat("goals", "1"), stat("attIboxGoal", "1"),
+                stat("attPenGoal", "1"), stat("attPenMiss", "1"), stat("minsPlayed", "90"),
+                stat("touches", "40"),
+            ]},
+            {"playerId": "p2", "matchName": "B", "stat": [stat("totalScoringAtt", "0")]},
+            {"playerId": "p3", "matchName": "C", "stat": [stat("passes", "12")]},
+        ]}]},
+    }
+
+    shots = scraper.extract_player_shots(match)
+
+    assert shots == scraper.extract_player_stats_and_shots(match)[1]
+    assert [s["player_id"] for s in shots] == ["p1"]
+    assert shots[0]["goals_inside_box"] == 1 and shots[0]["shots_penalty"] == 2